@@ -3,6 +3,13 @@ import pandas as pd
 import plotly.express as px
 from pathlib import Path
 import json
+import time
+import numpy as np
+from src.cluster import cluster_name
+from src.search import SearchIndex
+from src.termstats import TermStats
+from src.textstore import TEXT_COLUMNS, TextStore
+from src.viz import INTERACTIVE_BINS, bin_points, to_tiles, tiles_figure
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -13,14 +20,19 @@ st.set_page_config(
 
 # --- Caminhos (ajuste conforme a estrutura do seu projeto) ---
 PROC_PATH = Path("data/processed")
+CLUSTERS_PATH = PROC_PATH / "clusters"
+TEXTSTORE_PATH = PROC_PATH / "textstore"
+TERMSTATS_PATH = PROC_PATH / "termstats"
 FIGS_PATH = Path("reports/figures")
+MAX_HIGHLIGHT = 5_000  # pontos destacados no mapa por busca
+GROUPING_LABELS = {"label": "classe", "source": "fonte", "label_source": "classe × fonte", "cluster": "cluster"}
 
 # --- Funções de Cache para Carregar Dados (melhora a performance) ---
 @st.cache_data
-def load_data(file_path):
-    """Carrega um arquivo CSV de forma segura."""
+def load_data(file_path, skip_columns=()):
+    """Carrega um arquivo CSV de forma segura (sem as colunas em skip_columns)."""
     if file_path.exists():
-        return pd.read_csv(file_path)
+        return pd.read_csv(file_path, usecols=lambda c: c not in skip_columns)
     return None
 
 @st.cache_data
@@ -31,6 +43,50 @@ def load_json(file_path):
             return json.load(f)
     return None
 
+@st.cache_data
+def load_projection_tiles(file_path, x, y, color_by):
+    """Agrega a projeção em tiles: o gráfico tem custo constante, qualquer que seja o corpus."""
+    df = load_data(file_path)
+    if color_by == "cluster":
+        # ids por linha de unified_with_features.csv, calculados pela etapa 10
+        ids = np.load(CLUSTERS_PATH / "cluster_ids.npy")[df["row_id"].to_numpy()]
+        names = np.array([cluster_name(c) for c in range(max(int(ids.max()) + 1, 0))] + ["sem cluster"])
+        categories = names[ids]  # -1 cai em "sem cluster"
+    else:
+        categories = df[color_by]
+    raster = bin_points(df[x], df[y], categories=categories, bins=INTERACTIVE_BINS)
+    return to_tiles(raster)
+
+@st.cache_resource
+def load_search_index(index_dir):
+    """Abre o índice invertido (mmap) uma vez por sessão do servidor."""
+    if (index_dir / "meta.json").exists():
+        return SearchIndex.open(index_dir)
+    return None
+
+@st.cache_resource
+def load_text_store(store_dir):
+    """Abre o text store (mmap): os textos são lidos só para as linhas exibidas."""
+    if TextStore.exists(store_dir):
+        return TextStore.open(store_dir)
+    return None
+
+@st.cache_resource
+def load_term_stats(stats_dir):
+    """Estatísticas de termos por grupo calculadas pela etapa 11 (arrays mapeados em memória)."""
+    if TermStats.exists(stats_dir):
+        return TermStats.open(stats_dir)
+    return None
+
+def rows_with_texts(ids, columns=None):
+    """Linhas de df_features com os textos, lidos do text store só para essas linhas."""
+    ids = np.asarray(ids, dtype=np.int64)
+    rows = df_features.iloc[ids]
+    if text_store is not None:
+        texts = text_store.frame(ids)
+        rows = pd.concat([texts, rows.set_index(texts.index)], axis=1)
+    return rows if columns is None else rows[columns]
+
 # --- Título e Introdução ---
 st.title("📊 Análise e Visualização de Textos sobre Ideação Suicida")
 st.markdown("""
@@ -39,7 +95,10 @@ relacionados à ideação suicida. Explore os gráficos abaixo para entender a e
 """)
 
 # --- Carregar os dados ---
-df_features = load_data(PROC_PATH / "unified_with_features.csv")
+# com o text store, o dataframe em memória fica só com as colunas numéricas e categóricas
+text_store = load_text_store(TEXTSTORE_PATH)
+df_features = load_data(PROC_PATH / "unified_with_features.csv",
+                        skip_columns=tuple(TEXT_COLUMNS) if text_store is not None else ())
 df_umap = load_data(PROC_PATH / "umap2_full.csv")
 topics = load_json(PROC_PATH / "topics.json")
 
@@ -86,7 +145,10 @@ st.divider()
 
 # --- Gráfico UMAP Interativo ---
 st.header("Projeção UMAP Interativa")
-st.markdown("Passe o mouse sobre os pontos para ver detalhes. Use a legenda para filtrar.")
+st.markdown(
+    "Cada marcador agrega os textos de uma pequena região do mapa (tamanho = quantidade). "
+    "Passe o mouse para ver as contagens por categoria. Use a legenda para filtrar."
+)
 st.info(
     """
     **Conclusão Final: A História Contada pelo UMAP**
@@ -101,30 +163,95 @@ st.info(
     """
 )
 
+has_clusters = (CLUSTERS_PATH / "cluster_ids.npy").exists() and "row_id" in df_umap.columns
 color_option = st.selectbox(
     "Colorir projeção por:",
-    ("label", "source")
+    ("label", "source", "cluster") if has_clusters else ("label", "source")
 )
 
-fig_umap = px.scatter(
-    df_umap,
-    x="umap1",
-    y="umap2",
-    color=color_option,
-    hover_data={"umap1": False, "umap2": False, color_option: True},
-    title=f"Projeção UMAP 2D colorida por {color_option}",
-    labels={'color': color_option}
-)
-fig_umap.update_traces(marker=dict(size=5, opacity=0.7))
-fig_umap.update_layout(height=700)  # Aumenta a altura do gráfico
+umap_tiles = load_projection_tiles(PROC_PATH / "umap2_full.csv", "umap1", "umap2", color_option)
+fig_umap = tiles_figure(umap_tiles, title=f"Projeção UMAP 2D colorida por {color_option}")
+fig_umap.update_layout(legend_title_text=color_option)
+
+# --- Busca de textos (índice invertido) ---
+query = st.text_input("Buscar textos (destaca no mapa os textos que contêm todos os termos):", "")
+if query.strip():
+    search_index = load_search_index(PROC_PATH / "search_index")
+    if search_index is None:
+        st.warning("Índice de busca não encontrado. Execute `scripts/08_build_search_index.py`.")
+    else:
+        exact = st.checkbox("Frase exata", value=False)
+        t0 = time.perf_counter()
+        hits = search_index.search(query)
+        if exact and len(hits):
+            # o índice reduz os candidatos; a frase é conferida só neles
+            if text_store is not None:
+                texts = pd.Series(text_store.take(hits))
+            else:
+                texts = df_features["text_clean"].iloc[hits].fillna("").astype(str)
+            hits = hits[texts.str.contains(query.strip(), case=False, regex=False).to_numpy()]
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        st.caption(f"{len(hits):,} textos encontrados em {elapsed_ms:.1f} ms")
+
+        if "row_id" in df_umap.columns:
+            matched = df_umap[np.isin(df_umap["row_id"].to_numpy(), hits)]
+            if len(matched) > MAX_HIGHLIGHT:
+                matched = matched.sample(MAX_HIGHLIGHT, random_state=42)
+            fig_umap.add_scattergl(
+                x=matched["umap1"], y=matched["umap2"], mode="markers", name=f"busca: {query}",
+                marker=dict(color="black", size=5, symbol="x"),
+            )
+        else:
+            st.caption("Rode a etapa 03 novamente para destacar os resultados no mapa (coluna `row_id`).")
+        if len(hits):
+            st.dataframe(rows_with_texts(hits[:20], ["text_clean", "label", "source"]))
+
 st.plotly_chart(fig_umap, use_container_width=True)
 
+if color_option == "cluster":
+    cluster_summary = load_data(CLUSTERS_PATH / "cluster_summary.csv")
+    if cluster_summary is not None:
+        st.subheader("Resumo dos Clusters")
+        st.caption(
+            "Clusters do mini-batch k-means sobre o embedding SVD (etapa 10): tamanho, fração de textos "
+            "de ideação, fonte dominante e termos mais característicos de cada cluster."
+        )
+        st.dataframe(cluster_summary, use_container_width=True)
+
+        cluster_ids = np.load(CLUSTERS_PATH / "cluster_ids.npy", mmap_mode="r")
+        chosen = st.selectbox("Ver textos do cluster:", range(len(cluster_summary)), format_func=cluster_name)
+        members = np.flatnonzero(cluster_ids == chosen)
+        if text_store is not None and len(members):
+            sample_ids, _ = text_store.sample(10, ids=members, seed=42)
+            st.dataframe(rows_with_texts(sample_ids, ["text_clean", "label", "source"]))
+
+
+# --- Termos característicos por grupo ---
+term_stats = load_term_stats(TERMSTATS_PATH)
+if term_stats is not None:
+    st.header("Termos Característicos por Grupo")
+    st.markdown(
+        "Frequência (`tf`), número de textos (`df`), TF-IDF médio e log-odds de cada termo em um grupo "
+        "contra os demais do mesmo agrupamento, pré-calculados pela etapa 11. Ao agrupar por `source`, "
+        "os termos de maior log-odds mostram o \"sotaque\" de cada dataset."
+    )
+    col_g, col_v, col_m = st.columns(3)
+    grouping = col_g.selectbox("Agrupar por:", term_stats.groupings, format_func=lambda g: GROUPING_LABELS.get(g, g))
+    group = col_v.selectbox("Grupo:", term_stats.groups(grouping))
+    metric = col_m.selectbox("Ordenar por:", ["log_odds", "mean_tfidf", "tf", "df"])
+    st.dataframe(term_stats.top(grouping, group, by=metric, n=30, min_df=5), use_container_width=True)
+
+st.divider()
 
 # --- Amostra dos Dados ---
 st.header("Amostra dos Dados Processados")
 st.markdown("Abaixo uma amostra aleatória dos dados unificados e com features.")
 st.caption("A coluna `text_clean` contém o texto após a limpeza básica, usada para a vetorização.")
-st.dataframe(df_features.sample(10, random_state=42))
+if text_store is not None:
+    sample_ids, _ = text_store.sample(10, seed=42)
+else:
+    sample_ids = np.sort(np.random.default_rng(42).choice(len(df_features), 10, replace=False))
+st.dataframe(rows_with_texts(sample_ids))
 
 st.divider()
 
@@ -0,0 +1,75 @@
+"""
+CLI do pipeline.
+
+    python run_pipeline.py                  # executa o que estiver desatualizado
+    python run_pipeline.py run 03 04        # só essas etapas (se desatualizadas)
+    python run_pipeline.py run --force      # tudo de novo
+    python run_pipeline.py status           # o que está atualizado e por quê
+    python run_pipeline.py list             # etapas disponíveis
+
+Só a tabela de etapas (src/pipeline.py) é importada aqui; os scripts, e com eles as
+bibliotecas pesadas, só são carregados quando uma etapa executa.
+"""
+import argparse
+import sys
+import time
+from src.pipeline import DEPENDS, STAGES, mark_done, plan, read_state, stage_entry
+
+def cmd_list(args):
+    for sid, (filename, entry) in STAGES.items():
+        deps = ", ".join(DEPENDS[sid]) or "-"
+        print(f"{sid}  {filename:<30} {entry:<20} depende de: {deps}")
+    return 0
+
+def cmd_status(args):
+    state = read_state()
+    todo = plan(list(STAGES), state)
+    for sid in STAGES:
+        rec = state.get(sid)
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(rec["finished_at"])) if rec else "-"
+        mark = f"⏳ {todo[sid]}" if sid in todo else "✅ atualizada"
+        print(f"{sid}  {STAGES[sid][0]:<30} {when:<17} {mark}")
+    return 0
+
+def cmd_run(args):
+    stage_ids = args.stages or list(STAGES)
+    state = read_state()
+    todo = plan(stage_ids, state, force=args.force)
+    if not todo:
+        print("✅ Tudo atualizado, nada a executar (use --force para executar mesmo assim).")
+        return 0
+
+    # importado só aqui: os comandos de consulta não pagam o custo da instrumentação
+    from src.instrument import stage
+
+    @stage("pipeline")
+    def run_all():
+        for sid, reason in todo.items():
+            print(f"\n▶️  Etapa {sid} ({STAGES[sid][0]}): {reason}")
+            stage_entry(sid)()
+            mark_done(sid, state)
+
+    run_all()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline de análise de textos sobre ideação suicida.")
+    sub = parser.add_subparsers(dest="command")
+    p_run = sub.add_parser("run", help="Executa as etapas desatualizadas (padrão).")
+    p_run.add_argument("stages", nargs="*", metavar="ETAPA",
+                       help=f"Etapas a executar (padrão: todas). Opções: {', '.join(STAGES)}.")
+    p_run.add_argument("--force", action="store_true", help="Executa mesmo as etapas atualizadas.")
+    sub.add_parser("status", help="Mostra quais etapas estão atualizadas.")
+    sub.add_parser("list", help="Lista as etapas e suas dependências.")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        args = parser.parse_args(["run"])
+    unknown = [s for s in getattr(args, "stages", []) if s not in STAGES]
+    if unknown:
+        parser.error(f"etapa(s) desconhecida(s): {', '.join(unknown)} (opções: {', '.join(STAGES)})")
+    commands = {"run": cmd_run, "status": cmd_status, "list": cmd_list}
+    return commands[args.command](args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,38 @@
 import pandas as pd
-from src.features import build_numeric_features
+from src.features import numeric_features_frame
 from src.data_io import save_csv
+from src.instrument import span, stage
+from src.textstore import STORE_DIR, build_text_store
 from pathlib import Path
 
 PROC = Path("data/processed")
 
+@stage("02_features")
 def run():
     print("🚀 Gerando colunas de features numéricas...")
 
-    df = pd.read_csv(PROC / "unified.csv")
+    with span("02.read") as sp:
+        df = pd.read_csv(PROC / "unified.csv")
+        sp["rows"] = len(df)
 
-    # aplicar função e transformar a lista de dicionários em DataFrame
-    feat_dicts = df["text_clean"].apply(build_numeric_features)
-    feat_df = pd.DataFrame(list(feat_dicts))  # <- aqui está a diferença crucial
+    # mesmas métricas de build_numeric_features, calculadas coluna a coluna (versão em lote)
+    with span("02.numeric_features", rows=len(df)):
+        feat_df = numeric_features_frame(df["text_clean"])
+
+    # textos brutos e limpos vão para o text store (acesso aleatório por id da linha);
+    # o CSV mantém só text_clean, que as etapas de vetorização leem em bloco
+    with span("02.text_store", rows=len(df)):
+        store_meta = build_text_store({"text": df["text"], "text_clean": df["text_clean"]}, STORE_DIR)
 
     # juntar o dataframe original com as novas colunas
-    out = pd.concat([df, feat_df], axis=1)
+    out = pd.concat([df.drop(columns=["text"]), feat_df], axis=1)
 
     # salvar arquivo final
-    save_csv(out, PROC / "unified_with_features.csv")
-    print(f"✅ Features salvas em data/processed/unified_with_features.csv")
+    with span("02.save", rows=len(out)):
+        save_csv(out, PROC / "unified_with_features.csv")
+    print("✅ Features salvas em data/processed/unified_with_features.csv")
     print(f"✅ Colunas adicionadas: {list(feat_df.columns)}")
+    print(f"✅ Text store com {store_meta['n_rows']:,} textos salvo em {STORE_DIR}")
 
 if __name__ == "__main__":
     run()
@@ -1,70 +1,161 @@
+import argparse
+import json
+import shutil
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import TruncatedSVD
-from sklearn.manifold import TSNE
-import umap
+from src.config import use_numba_cache
 from src.data_io import save_csv
+from src.instrument import span, stage
+from src.registry import get_registry, hash_inputs
+from src.vectorize import char_ngram_matrix, make_char_hasher, save_csr
 from pathlib import Path
 
 PROC = Path("data/processed")
+FEATURES = PROC / "features"  # matrizes persistidas (CSR mapeável) por backend
+BACKENDS = ("tfidf", "charhash")
+MAX_DENSE_COLS = 50_000  # acima disso o t-SNE recebe uma redução SVD em vez da matriz densa
+UMAP_PARAMS = dict(
+    n_components=2,
+    n_neighbors=15,
+    min_dist=0.1,
+    n_jobs=-1  # Usa todos os núcleos de CPU para acelerar o processo
+)
+TSNE_PARAMS = dict(n_components=2, init="random", learning_rate="auto", perplexity=30, random_state=42)
 
-def run():
-    print("🚀 Iniciando vetorização e projeções...")
-    df = pd.read_csv(PROC / "unified_with_features.csv")
+@stage("03_vectorize")
+def run(features="tfidf"):
+    """
+    Vetoriza os textos e gera as projeções 2D.
+    features: "tfidf" (palavras, vocabulário com min_df) ou "charhash" (char n-grams com hashing).
+    """
+    print(f"🚀 Iniciando vetorização e projeções (features: {features})...")
+    with span("03.read") as sp:
+        df = pd.read_csv(PROC / "unified_with_features.csv")
+        sp["rows"] = len(df)
 
     # --- Corrigir NaN e garantir strings válidas ---
     df["text_clean"] = df["text_clean"].fillna("").astype(str)
-    df = df[df["text_clean"].str.strip() != ""].reset_index(drop=True)
+    df = df[df["text_clean"].str.strip() != ""]
+    row_ids = df.index.to_numpy()  # posição de cada linha em unified_with_features.csv
+    df = df.reset_index(drop=True)
     print(f"✅ Total de registros válidos: {df.shape[0]}")
 
-    # --- TF-IDF com limitação de vocabulário ---
-    # reduz o vocabulário (menos memória, melhor performance)
-    tfidf = TfidfVectorizer(min_df=10, max_df=0.7, ngram_range=(1, 1))
-    X = tfidf.fit_transform(df["text_clean"])
-    print(f"📊 Matriz TF-IDF criada com formato: {X.shape}")
+    # --- Registro de modelos: reaproveita o que já foi treinado com os mesmos dados ---
+    registry = get_registry()
+    texts_hash = hash_inputs(df["text_clean"])
+
+    feat_dir = FEATURES / features
+    if feat_dir.exists():
+        shutil.rmtree(feat_dir)
+    if features == "charhash":
+        # --- Char n-grams com hashing: sem vocabulário, blocos em paralelo gravados em disco ---
+        vectorizer = make_char_hasher()
+        with span("03.charhash", rows=len(df)):
+            X = char_ngram_matrix(df["text_clean"], vectorizer, out_dir=feat_dir / "X")
+        # o hasher não é treinado, mas fica registrado para o scoring reproduzir as features
+        registry.save("charhash", vectorizer, texts_hash)
+        print(f"📊 Matriz de char n-grams (hashing) criada com formato: {X.shape}")
+    else:
+        # --- TF-IDF com limitação de vocabulário ---
+        # reduz o vocabulário (menos memória, melhor performance)
+        vectorizer = TfidfVectorizer(min_df=10, max_df=0.7, ngram_range=(1, 1))
+        with span("03.tfidf", rows=len(df)):
+            cached = registry.lookup("tfidf", vectorizer, texts_hash)
+            if cached is not None:
+                vectorizer = cached
+                X = vectorizer.transform(df["text_clean"])
+            else:
+                X = vectorizer.fit_transform(df["text_clean"])
+                registry.save("tfidf", vectorizer, texts_hash)
+            save_csr(X, feat_dir / "X")
+        print(f"📊 Matriz TF-IDF criada com formato: {X.shape}{' (modelo em cache)' if cached is not None else ''}")
+    np.save(feat_dir / "row_ids.npy", row_ids)
+
+    # as etapas seguintes dependem da versão do vetorizador e dos textos
+    vectorizer_version = registry.version_key(vectorizer, texts_hash)
+    with open(feat_dir / "vectorizer.json", "w", encoding="utf-8") as f:
+        # qual versão do registro gerou esta matriz (vocabulário das etapas 10 e 11)
+        json.dump({"name": features, "version": vectorizer_version}, f, indent=2)
+    X_hash = hash_inputs(texts_hash, vectorizer_version)
+    # outros backends usam modelos e arquivos com sufixo: as projeções do TF-IDF (lidas pelo app,
+    # pela etapa 04, pelo relatório e pelo scoring) não são sobrescritas
+    suffix = "" if features == "tfidf" else f"_{features}"
 
     # --- Projeção 2D com TruncatedSVD (PCA esparso, mais leve) ---
     print("⚙️  Gerando SVD (PCA esparso) 2D...")
     svd = TruncatedSVD(n_components=2, random_state=42)
-    pca2 = svd.fit_transform(X)
+    with span("03.svd", rows=X.shape[0]):
+        cached = registry.lookup(f"svd2{suffix}", svd, X_hash)
+        if cached is not None:
+            svd = cached
+            pca2 = svd.transform(X)
+        else:
+            pca2 = svd.fit_transform(X)
+            registry.save(f"svd2{suffix}", svd, X_hash)
     pca_df = pd.DataFrame(pca2, columns=["pca1", "pca2"])
     pca_df["idx"] = range(len(pca_df))
-    save_csv(pca_df, PROC / "pca2_sample.csv")
-    print("✅ Projeção SVD (PCA esparso) salva em pca2_sample.csv")
+    save_csv(pca_df, PROC / f"pca2_sample{suffix}.csv")
+    print(f"✅ Projeção SVD (PCA esparso) salva em pca2_sample{suffix}.csv")
 
     # --- UMAP 2D (estrutura global dos dados) ---
     print("⚙️  Gerando projeção UMAP 2D (pode demorar alguns minutos)...")
-    reducer = umap.UMAP(
-        n_components=2,
-        n_neighbors=15,
-        min_dist=0.1,
-        n_jobs=-1  # Usa todos os núcleos de CPU para acelerar o processo
-    )
-    umap2 = reducer.fit_transform(X)
+    with span("03.umap", rows=X.shape[0]):
+        # a versão vem de UMAP_PARAMS: com cache, nem é preciso importar o umap (numba, lento)
+        version = registry.find(f"umap2{suffix}", UMAP_PARAMS, X_hash)
+        if version is not None:
+            umap2 = registry.load_array(f"umap2{suffix}", "embedding", version)
+            print("   (projeção UMAP reaproveitada do registro de modelos)")
+        else:
+            use_numba_cache()
+            import umap
+            reducer = umap.UMAP(**UMAP_PARAMS)
+            umap2 = reducer.fit_transform(X)
+            registry.save(f"umap2{suffix}", reducer, X_hash, arrays={"embedding": umap2})
     umap_df = pd.DataFrame(umap2, columns=["umap1", "umap2"])
-    save_csv(pd.concat([df[["label", "source"]], umap_df], axis=1), PROC / "umap2_full.csv")
-    print("✅ Projeção UMAP salva em umap2_full.csv")
+    umap_df["row_id"] = row_ids  # liga cada ponto à linha de unified_with_features.csv (busca no app)
+    save_csv(pd.concat([df[["label", "source"]], umap_df], axis=1), PROC / f"umap2_full{suffix}.csv")
+    print(f"✅ Projeção UMAP salva em umap2_full{suffix}.csv")
 
     # --- t-SNE (visualização local em pequena amostra) ---
     print("⚙️  Gerando projeção t-SNE (amostragem reduzida)...")
     n_ts = min(2000, X.shape[0])  # reduzir para poupar memória
-    tsne2 = TSNE(
-        n_components=2,
-        init="random",
-        learning_rate="auto",
-        perplexity=30,
-        random_state=42
-    ).fit_transform(X[:n_ts].toarray().astype("float32"))
+    with span("03.tsne", rows=n_ts):
+        tsne_hash = hash_inputs(X_hash, n_ts)
+        version = registry.find(f"tsne2{suffix}", TSNE_PARAMS, tsne_hash)
+        if version is not None:
+            tsne2 = registry.load_array(f"tsne2{suffix}", "embedding", version)
+            print("   (projeção t-SNE reaproveitada do registro de modelos)")
+        else:
+            X_ts = X[:n_ts]
+            # colunas vazias na amostra não alteram as distâncias: descarta antes de densificar
+            X_ts = X_ts[:, np.unique(X_ts.indices)]
+            if X_ts.shape[1] > MAX_DENSE_COLS:
+                # ainda largo demais (ex.: espaço de hashing): reduz com SVD
+                X_ts = TruncatedSVD(n_components=50, random_state=42).fit_transform(X_ts).astype("float32")
+            else:
+                X_ts = X_ts.toarray().astype("float32")
+            from sklearn.manifold import TSNE
+            tsne = TSNE(**TSNE_PARAMS)
+            tsne2 = tsne.fit_transform(X_ts)
+            registry.save(f"tsne2{suffix}", tsne, tsne_hash, arrays={"embedding": tsne2})
     tsne_df = pd.DataFrame(tsne2, columns=["tsne1", "tsne2"])
     tsne_df["idx"] = range(n_ts)
-    save_csv(tsne_df, PROC / "tsne2_sample.csv")
-    print("✅ Projeção t-SNE salva em tsne2_sample.csv")
+    save_csv(tsne_df, PROC / f"tsne2_sample{suffix}.csv")
+    print(f"✅ Projeção t-SNE salva em tsne2_sample{suffix}.csv")
 
     # --- Salvar o vetorizador TF-IDF ---
-    joblib.dump(tfidf, PROC / "tfidf_vectorizer.joblib")
-    print("💾 Vetorizador TF-IDF salvo em tfidf_vectorizer.joblib")
+    if features == "tfidf":
+        joblib.dump(vectorizer, PROC / "tfidf_vectorizer.joblib")
+        print("💾 Vetorizador TF-IDF salvo em tfidf_vectorizer.joblib")
+    print(f"💾 Matriz de features salva em {feat_dir}")
     print("🎉 Vetores e projeções gerados com sucesso!")
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Vetorização e projeções 2D (SVD, UMAP, t-SNE).")
+    parser.add_argument("--features", choices=BACKENDS, default="tfidf",
+                        help="Backend de features: TF-IDF de palavras ou char n-grams com hashing.")
+    args = parser.parse_args()
+    run(features=args.features)
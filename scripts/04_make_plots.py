@@ -1,7 +1,8 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 from src.data_io import ensure_dir
+from src.instrument import span, stage
+from src.viz import bin_points, render_png
 from pathlib import Path
 
 PROC = Path("data/processed")
@@ -33,6 +34,7 @@ def plot_corr(df):
         print("⚠️ Colunas numéricas não encontradas, pulando heatmap de correlação.")
         return
 
+    import seaborn as sns  # import pesado: só quando o heatmap é gerado
     corr = df[cols_exist].corr()
     plt.figure(figsize=(7, 5))
     sns.heatmap(corr, annot=False, cmap="vlag", center=0)
@@ -43,29 +45,46 @@ def plot_corr(df):
     print("✅ Heatmap de correlação salvo.")
 
 def plot_umap():
-    """Gráficos das projeções UMAP coloridos por label e por source."""
+    """
+    Gráficos das projeções UMAP coloridos por label e por source.
+    Os pontos são agregados em grade (src.viz), com custo constante qualquer que seja o corpus.
+    """
     umap_file = PROC / "umap2_full.csv"
     if not umap_file.exists():
         print("⚠️ Arquivo umap2_full.csv não encontrado, pulando UMAP.")
-        return
+        return None
 
     umap_df = pd.read_csv(umap_file)
     for color_by in ["label", "source"]:
         if color_by not in umap_df.columns:
             continue
-        plt.figure(figsize=(6, 5))
-        sns.scatterplot(
-            data=umap_df,
-            x="umap1", y="umap2",
-            hue=color_by, s=10, alpha=0.6, linewidth=0
-        )
-        plt.title(f"UMAP 2D colorido por {color_by}")
-        plt.legend(markerscale=2, bbox_to_anchor=(1.02, 1), loc="upper left")
-        plt.tight_layout()
-        plt.savefig(FIGS / f"umap_{color_by}.png", dpi=180)
-        plt.close()
+        with span(f"04.umap_{color_by}", rows=len(umap_df)):
+            raster = bin_points(umap_df["umap1"], umap_df["umap2"], categories=umap_df[color_by])
+            render_png(raster, FIGS / f"umap_{color_by}.png", title=f"UMAP 2D colorido por {color_by}")
         print(f"✅ Gráfico UMAP colorido por {color_by} salvo.")
+    return umap_df
+
+def plot_pca_tsne(umap_df):
+    """Projeções SVD (PCA esparso) e t-SNE coloridas por label."""
+    if umap_df is None or "label" not in umap_df.columns:
+        return
+    labels = umap_df["label"].to_numpy()
+    for name, filename, (xcol, ycol) in [
+        ("pca", "pca2_sample.csv", ("pca1", "pca2")),
+        ("tsne", "tsne2_sample.csv", ("tsne1", "tsne2")),
+    ]:
+        path = PROC / filename
+        if not path.exists():
+            print(f"⚠️ Arquivo {filename} não encontrado, pulando {name.upper()}.")
+            continue
+        proj = pd.read_csv(path)
+        # 'idx' é a linha correspondente em umap2_full.csv (mesma ordem de vetorização)
+        with span(f"04.{name}_label", rows=len(proj)):
+            raster = bin_points(proj[xcol], proj[ycol], categories=labels[proj["idx"].to_numpy()])
+            render_png(raster, FIGS / f"{name}_label.png", title=f"{name.upper()} 2D colorido por label")
+        print(f"✅ Gráfico {name.upper()} colorido por label salvo.")
 
+@stage("04_plots")
 def run():
     print("📊 Gerando gráficos...")
     csv_path = PROC / "unified_with_features.csv"
@@ -74,10 +93,14 @@ def run():
         csv_path = PROC / "unified.csv"
         print("⚠️ Arquivo unified_with_features.csv não encontrado. Usando unified.csv.")
 
-    df = pd.read_csv(csv_path)
-    plot_balance(df)
-    plot_corr(df)
-    plot_umap()
+    with span("04.read") as sp:
+        df = pd.read_csv(csv_path)
+        sp["rows"] = len(df)
+    with span("04.balance_corr", rows=len(df)):
+        plot_balance(df)
+        plot_corr(df)
+    umap_df = plot_umap()
+    plot_pca_tsne(umap_df)
     print(f"🎨 Figuras salvas em: {FIGS}")
     print("🎉 Gráficos gerados com sucesso!")
 
@@ -3,6 +3,8 @@ import json
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 from src.data_io import ensure_dir
+from src.instrument import span, stage
+from src.registry import get_registry, hash_inputs
 from pathlib import Path
 
 PROC = Path("data/processed")
@@ -10,12 +12,15 @@ N_TOPICS = 10  # Número de tópicos que queremos encontrar
 N_TOP_WORDS = 15 # Número de palavras para descrever cada tópico
 MAX_SAMPLES_FOR_LDA = 100000 # Limita o número de amostras para acelerar o LDA
 
+@stage("05_topics")
 def run_topic_modeling():
     """
     Executa a modelagem de tópicos LDA nos textos limpos.
     """
     print("🚀 Iniciando Modelagem de Tópicos (LDA)...")
-    df = pd.read_csv(PROC / "unified_with_features.csv")
+    with span("05.read") as sp:
+        df = pd.read_csv(PROC / "unified_with_features.csv")
+        sp["rows"] = len(df)
 
     # Garantir que o texto seja uma string limpa
     df["text_clean"] = df["text_clean"].fillna("").astype(str)
@@ -36,7 +41,16 @@ def run_topic_modeling():
     vectorizer = CountVectorizer(
         max_df=0.8, min_df=20, stop_words='english', ngram_range=(1, 1)
     )
-    X = vectorizer.fit_transform(texts)
+    registry = get_registry()
+    texts_hash = hash_inputs(texts)
+    with span("05.count_vectorizer", rows=len(texts)):
+        cached = registry.lookup("count_lda", vectorizer, texts_hash)
+        if cached is not None:
+            vectorizer = cached
+            X = vectorizer.transform(texts)
+        else:
+            X = vectorizer.fit_transform(texts)
+            registry.save("count_lda", vectorizer, texts_hash)
     print(f"📊 Matriz de contagem criada com formato: {X.shape}")
 
     # Treinamento do modelo LDA
@@ -46,8 +60,16 @@ def run_topic_modeling():
         learning_method='online', # Eficiente para datasets grandes
         n_jobs=-1
     )
-    lda.fit(X)
-    print("✅ Modelo LDA treinado.")
+    X_hash = hash_inputs(texts_hash, registry.version_key(vectorizer, texts_hash))
+    with span("05.lda", rows=X.shape[0]):
+        cached = registry.lookup("lda", lda, X_hash)
+        if cached is not None:
+            lda = cached
+            print("✅ Modelo LDA reaproveitado do registro de modelos.")
+        else:
+            lda.fit(X)
+            registry.save("lda", lda, X_hash)
+            print("✅ Modelo LDA treinado.")
 
     # Extração e salvamento dos tópicos
     feature_names = vectorizer.get_feature_names_out()
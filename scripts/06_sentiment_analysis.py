@@ -4,43 +4,28 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 import pandas as pd
-from textblob import TextBlob
 from src.data_io import save_csv
+from src.instrument import span, stage
+from src.sentiment import analyze_sentiment
 
 PROC = Path("data/processed")
 
-def analyze_sentiment(text):
-    """
-    Analisa um texto e retorna polaridade, subjetividade e um rótulo de sentimento.
-    Otimizado para ser chamado uma única vez por texto.
-    """
-    if not isinstance(text, str) or not text.strip():
-        return 0.0, 0.0, 'Neutro'
-
-    analysis = TextBlob(text)
-    polarity = analysis.sentiment.polarity
-    subjectivity = analysis.sentiment.subjectivity
-
-    if polarity > 0:
-        label = 'Positivo'
-    elif polarity < 0:
-        label = 'Negativo'
-    else:
-        label = 'Neutro'
-    
-    return polarity, subjectivity, label
-
+@stage("06_sentiment")
 def run():
     print("🚀 Iniciando Análise de Sentimento...")
-    df = pd.read_csv(PROC / "unified_with_features.csv")
+    with span("06.read") as sp:
+        df = pd.read_csv(PROC / "unified_with_features.csv")
+        sp["rows"] = len(df)
 
     df["text_clean"] = df["text_clean"].fillna("").astype(str)
 
     # Otimização: Aplicar a análise uma vez e descompactar os resultados em 3 colunas
-    sentiments = df['text_clean'].apply(analyze_sentiment)
+    with span("06.textblob", rows=len(df)):
+        sentiments = df['text_clean'].apply(analyze_sentiment)
     df[['sentiment_polarity', 'sentiment_subjectivity', 'sentiment_label']] = pd.DataFrame(sentiments.tolist(), index=df.index)
 
-    save_csv(df, PROC / "unified_with_features.csv") # Sobrescreve com as novas colunas
+    with span("06.save", rows=len(df)):
+        save_csv(df, PROC / "unified_with_features.csv") # Sobrescreve com as novas colunas
     print(f"✅ Análise de sentimento concluída e dados salvos em: {PROC / 'unified_with_features.csv'}")
 
 if __name__ == "__main__":
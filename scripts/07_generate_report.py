@@ -1,38 +1,68 @@
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
 import base64
 import json
-from pathlib import Path
 import pandas as pd
 from datetime import datetime
-from wordcloud import WordCloud
-from sklearn.feature_extraction.text import TfidfVectorizer
-import matplotlib.pyplot as plt
 import numpy as np
+from src.instrument import span, stage
+from src.termstats import TermStats
+from src.textstore import TEXT_COLUMNS, TextStore
+from src.viz import bin_points, render_png
 
 # --- Caminhos ---
 BASE_DIR = Path(__file__).resolve().parent.parent
 PROC = BASE_DIR / "data" / "processed"
 FIGS = BASE_DIR / "reports" / "figures"
 REPORTS = BASE_DIR / "reports"
+WORDCLOUD_MAX_TEXTS = 50_000  # amostra por classe: as frequências se estabilizam bem antes disso
 
 # --- Função auxiliar: converter imagem em base64 ---
 def img_to_base64(path):
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode("utf-8")
 
+# --- Projeção UMAP (gerada aqui se a etapa 04 não tiver rodado) ---
+def umap_img_base64(color_by):
+    path = FIGS / f"umap_{color_by}.png"
+    umap_file = PROC / "umap2_full.csv"
+    if not path.exists() and umap_file.exists():
+        umap_df = pd.read_csv(umap_file, usecols=["umap1", "umap2", color_by])
+        raster = bin_points(umap_df["umap1"], umap_df["umap2"], categories=umap_df[color_by])
+        FIGS.mkdir(parents=True, exist_ok=True)
+        render_png(raster, path, title=f"UMAP 2D colorido por {color_by}")
+    return img_to_base64(path)
+
+# --- Textos de uma classe (do text store, só as linhas pedidas; sem ele, do CSV) ---
+def class_texts(store, df, label_value, max_texts=None):
+    ids = np.flatnonzero((df["label"] == label_value).to_numpy())
+    if max_texts is not None and len(ids) > max_texts:
+        ids = np.sort(np.random.default_rng(42).choice(ids, max_texts, replace=False))
+    if store is not None:
+        texts = store.take(ids)
+    else:
+        texts = df["text_clean"].iloc[ids].fillna("").astype(str).tolist()
+    return pd.Series([t for t in texts if t], dtype=object)  # vazios eram NaN no CSV
+
 # --- Nuvem de palavras ---
-def generate_wordcloud(df, label_value, output_name):
-    subset = df[df["label"] == label_value]["text_clean"].dropna()
+def generate_wordcloud(store, df, label_value, output_name):
+    subset = class_texts(store, df, label_value, max_texts=WORDCLOUD_MAX_TEXTS)
     text = " ".join(subset)
+    from wordcloud import WordCloud
     wc = WordCloud(width=800, height=400, background_color="white", colormap="plasma").generate(text)
     path = FIGS / output_name
     wc.to_file(path)
     return img_to_base64(path)
 
 # --- Top palavras por classe ---
-def top_tfidf_terms_by_class(df, label_value, top_n=20):
-    subset = df[df["label"] == label_value]["text_clean"].dropna()
+def top_tfidf_terms_by_class(store, df, label_value, top_n=20):
+    subset = class_texts(store, df, label_value)
     if subset.empty:
         return pd.DataFrame(columns=["termo", "peso"])
+    from sklearn.feature_extraction.text import TfidfVectorizer
     vectorizer = TfidfVectorizer(max_df=0.8, min_df=5, stop_words="english")
     X = vectorizer.fit_transform(subset)
     means = np.asarray(X.mean(axis=0)).ravel()
@@ -40,6 +70,34 @@ def top_tfidf_terms_by_class(df, label_value, top_n=20):
     top_idx = means.argsort()[::-1][:top_n]
     return pd.DataFrame({"termo": vocab[top_idx], "peso": means[top_idx]})
 
+# --- Top palavras por classe a partir das estatísticas da etapa 11 (sem reajustar TF-IDF) ---
+def top_terms_by_class(stats, store, df, label_value, top_n=20):
+    """Termos mais distintivos da classe (log-odds); sem o cache da etapa 11, recalcula o TF-IDF."""
+    if stats is not None and str(label_value) in stats.groups("label"):
+        top = stats.top("label", label_value, by="log_odds", n=top_n, min_df=5)
+        return top.rename(columns={"mean_tfidf": "peso"})[["termo", "peso", "log_odds"]]
+    return top_tfidf_terms_by_class(store, df, label_value, top_n)
+
+# --- "Sotaque" de cada fonte: termos com maior log-odds contra as demais fontes ---
+def source_accent_html(stats, top_n=12):
+    if stats is None or "source" not in stats.groupings:
+        return ""
+    rows = ""
+    for source in stats.groups("source"):
+        top = stats.top("source", source, by="log_odds", n=top_n, min_df=5)
+        badges = "".join(f"<span style='background:#e1e4e8; color:#24292e; padding:2px 8px; margin:2px; border-radius:12px; font-size:0.85em; display:inline-block; border:1px solid #d1d5da;'>{t}</span>" for t in top["termo"])
+        rows += f"<div style='margin-bottom:15px;'><b>{source}</b><br><div style='margin-top:5px;'>{badges}</div></div>"
+    return f"""
+    <div class="card">
+        <h2>Vocabulário Característico de Cada Fonte</h2>
+        {rows}
+        <div style="margin-top:15px; padding:15px; background:#f4f6f9; border-left:4px solid #2a4b8d; border-radius:4px; font-size:0.95em;">
+            <b>Viés de Fonte:</b><br>
+            Termos ordenados pelo log-odds (com prior informativo) de aparecerem em uma fonte e não nas demais. Vocabulário muito específico de uma fonte é o "sotaque" que um modelo pode aprender no lugar do fenômeno clínico; esses termos são candidatos a inspeção antes do treinamento.
+        </div>
+    </div>
+    """
+
 # --- Geração de interpretação automática ---
 def gerar_interpretacao(df, top0, top1):
     texto = []
@@ -61,10 +119,16 @@ def gerar_interpretacao(df, top0, top1):
     if not top0.empty and not top1.empty:
         top_terms_0 = ", ".join(top0["termo"].head(5))
         top_terms_1 = ", ".join(top1["termo"].head(5))
-        texto.append(
-            f"As palavras mais típicas em mensagens não suicidas são <b>{top_terms_0}</b>, "
-            f"enquanto em mensagens com ideação suicida predominam <b>{top_terms_1}</b>."
-        )
+        if "log_odds" in top0.columns:
+            texto.append(
+                f"Pelo log-odds, as palavras que mais distinguem mensagens não suicidas são <b>{top_terms_0}</b>, "
+                f"enquanto as que mais distinguem mensagens com ideação suicida são <b>{top_terms_1}</b>."
+            )
+        else:
+            texto.append(
+                f"As palavras mais típicas em mensagens não suicidas são <b>{top_terms_0}</b>, "
+                f"enquanto em mensagens com ideação suicida predominam <b>{top_terms_1}</b>."
+            )
 
     texto.append("Esses padrões sugerem diferenças linguísticas relevantes entre os grupos, "
                  "possibilitando o uso de modelos de machine learning supervisionados para predição futura "
@@ -83,6 +147,7 @@ def generate_sentiment_chart(df):
     values = [counts[x] for x in labels]
     colors = ["#d62728" if x == "Negativo" else "#7f7f7f" if x == "Neutro" else "#2ca02c" for x in labels]
 
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(8, 5))
     bars = plt.bar(labels, values, color=colors, alpha=0.8, edgecolor='black')
     plt.title("Distribuição de Sentimento dos Textos")
@@ -96,10 +161,19 @@ def generate_sentiment_chart(df):
     return img_to_base64(path)
 
 # --- Relatório HTML ---
-if __name__ == "__main__":
+@stage("07_report")
+def run():
     print("🧩 Gerando relatório final com interpretação automática...")
 
-    df = pd.read_csv(PROC / "unified_with_features.csv")
+    # os textos vêm do text store; do CSV só as colunas numéricas e categóricas
+    store = TextStore.open(PROC / "textstore") if TextStore.exists(PROC / "textstore") else None
+    if store is None:
+        print("⚠️ Text store não encontrado (rode a etapa 02 de novo); lendo os textos do CSV.")
+    skip = TEXT_COLUMNS if store is not None else ["text"]
+    with span("07.read") as sp:
+        df = pd.read_csv(PROC / "unified_with_features.csv", usecols=lambda c: c not in skip)
+        sp["rows"] = len(df)
+    stats = TermStats.open(PROC / "termstats") if TermStats.exists(PROC / "termstats") else None
 
     # Estatísticas
     n_total = len(df)
@@ -112,31 +186,60 @@ if __name__ == "__main__":
     # Carregar gráficos
     img_balance = img_to_base64(FIGS / "balanceamento_classes.png")
     img_corr = img_to_base64(FIGS / "correlacao.png")
-    img_umap_label = img_to_base64(FIGS / "umap_label.png")
-    img_umap_source = img_to_base64(FIGS / "umap_source.png")
+    img_umap_label = umap_img_base64("label")
+    img_umap_source = umap_img_base64("source")
     img_sentiment = generate_sentiment_chart(df)
 
     # Nuvens e TF-IDF
     print("☁️  Gerando nuvens de palavras e top termos...")
-    wc_0 = generate_wordcloud(df, 0, "wordcloud_class0.png")
-    wc_1 = generate_wordcloud(df, 1, "wordcloud_class1.png")
-    top0 = top_tfidf_terms_by_class(df, 0)
-    top1 = top_tfidf_terms_by_class(df, 1)
+    with span("07.wordclouds", rows=len(df)):
+        wc_0 = generate_wordcloud(store, df, 0, "wordcloud_class0.png")
+        wc_1 = generate_wordcloud(store, df, 1, "wordcloud_class1.png")
+    with span("07.top_terms", rows=len(df)):
+        top0 = top_terms_by_class(stats, store, df, 0)
+        top1 = top_terms_by_class(stats, store, df, 1)
+    html_sources = source_accent_html(stats)
 
     interpretacao = gerar_interpretacao(df, top0, top1)
 
-    # Tabelas TF-IDF
+    # Tabelas de termos: a coluna em destaque é a que define a ordem (log-odds da etapa 11 ou,
+    # sem ela, o peso TF-IDF médio)
     def df_to_html_table(df, color):
         if df.empty:
             return "<p><i>Sem dados disponíveis.</i></p>"
-        rows = "".join(
-            f"<tr><td>{r.termo}</td><td style='color:{color}; font-weight:bold;'>{r.peso:.4f}</td></tr>"
-            for r in df.itertuples()
-        )
-        return f"<table style='border-collapse:collapse; width:80%; margin:auto;'><tr style='background:#f0f4f9;'><th>Termo</th><th>Peso TF-IDF Médio</th></tr>{rows}</table>"
+        if "log_odds" in df.columns:
+            rows = "".join(
+                f"<tr><td>{r.termo}</td><td style='color:{color}; font-weight:bold;'>{r.log_odds:.1f}</td>"
+                f"<td>{r.peso:.4f}</td></tr>"
+                for r in df.itertuples()
+            )
+            head = "<th>Termo</th><th>Log-odds (z)</th><th>Peso TF-IDF Médio</th>"
+        else:
+            rows = "".join(
+                f"<tr><td>{r.termo}</td><td style='color:{color}; font-weight:bold;'>{r.peso:.4f}</td></tr>"
+                for r in df.itertuples()
+            )
+            head = "<th>Termo</th><th>Peso TF-IDF Médio</th>"
+        return f"<table style='border-collapse:collapse; width:80%; margin:auto;'><tr style='background:#f0f4f9;'>{head}</tr>{rows}</table>"
 
     table0_html = df_to_html_table(top0, "#2a4b8d")
     table1_html = df_to_html_table(top1, "#b03060")
+    if "log_odds" in top0.columns:
+        title_terms = "Top 20 Palavras Distintivas por Classe"
+        txt_terms = """
+        <div style="margin-top:15px; padding:15px; background:#f4f6f9; border-left:4px solid #2a4b8d; border-radius:4px; font-size:0.95em;">
+            <b>Ordenação:</b><br>
+            Termos ordenados pelo log-odds (z-score, com prior informativo) de aparecerem na classe e não na outra. O peso TF-IDF médio mostra quanto o termo pesa, em média, nos textos da classe.
+        </div>
+        """
+    else:
+        title_terms = "Top 20 Palavras por Classe"
+        txt_terms = """
+        <div style="margin-top:15px; padding:15px; background:#f4f6f9; border-left:4px solid #2a4b8d; border-radius:4px; font-size:0.95em;">
+            <b>Ordenação:</b><br>
+            Termos ordenados pelo peso TF-IDF médio nos textos da classe.
+        </div>
+        """
 
     # --- Textos Explicativos (Baseados no app.py) ---
     txt_balance = """
@@ -251,7 +354,8 @@ footer{{text-align:center;padding:20px;background:#2a4b8d;color:white;font-size:
 {txt_sentiment}
 {html_topics}
 <div class="card"><h2>Nuvens de Palavras</h2><h3>Classe 0 — Não Suicida</h3><img src="data:image/png;base64,{wc_0}"/><h3>Classe 1 — Ideação Suicida</h3><img src="data:image/png;base64,{wc_1}"/></div>
-<div class="card"><h2>Top 20 Palavras por Classe</h2><h3>Classe 0 — Não Suicida</h3>{table0_html}<h3>Classe 1 — Ideação Suicida</h3>{table1_html}</div>
+{html_sources}
+<div class="card"><h2>{title_terms}</h2><h3>Classe 0 — Não Suicida</h3>{table0_html}<h3>Classe 1 — Ideação Suicida</h3>{table1_html}{txt_terms}</div>
 <div class="card"><h2>Análise Interpretativa</h2><div class="analysis">{interpretacao}</div></div>
 </section>
 
@@ -270,4 +374,6 @@ C:\\Developer\\Suicide-text-viz
 
     print(f"✅ Relatório final salvo em: {out_path}")
     print("Abra o arquivo no navegador para visualizar.")
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    run()
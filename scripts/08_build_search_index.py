@@ -0,0 +1,24 @@
+import pandas as pd
+from src.instrument import span, stage
+from src.search import INDEX_DIR, build_index
+from pathlib import Path
+
+PROC = Path("data/processed")
+
+@stage("08_search_index")
+def run():
+    print("🚀 Construindo índice invertido para busca de textos...")
+    with span("08.read") as sp:
+        df = pd.read_csv(PROC / "unified_with_features.csv", usecols=["text_clean"])
+        sp["rows"] = len(df)
+
+    # id de cada documento = posição da linha em unified_with_features.csv
+    texts = df["text_clean"].fillna("").astype(str)
+    with span("08.build", rows=len(texts)):
+        meta = build_index(texts, INDEX_DIR)
+
+    print(f"✅ Índice com {meta['n_terms']:,} termos e {meta['n_postings']:,} postings "
+          f"para {meta['n_docs']:,} textos salvo em {INDEX_DIR}")
+
+if __name__ == "__main__":
+    run()
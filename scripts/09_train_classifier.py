@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import json
+import numpy as np
+import pandas as pd
+from src.classify import N_EPOCHS, load_features, run_folds, train_incremental
+from src.config import METRICS
+from src.data_io import ensure_dir, save_csv
+from src.instrument import span, stage
+from src.registry import get_registry, hash_inputs
+
+PROC = Path("data/processed")
+BACKENDS = ("tfidf", "charhash")
+
+@stage("09_classifier")
+def run(features="tfidf", n_epochs=N_EPOCHS, max_workers=None):
+    """
+    Classificador base (SGD, out-of-core) sobre as features da etapa 03, com avaliação
+    leave-one-source-out: mede quanto o desempenho cai em uma fonte que o modelo nunca viu.
+    """
+    print(f"🚀 Treinando classificador base (features: {features})...")
+    X, row_ids = load_features(features)
+    with span("09.read") as sp:
+        meta = pd.read_csv(PROC / "unified_with_features.csv", usecols=["label", "source"])
+        sp["rows"] = len(meta)
+    # alinhado com as linhas da matriz (a etapa 03 descarta textos vazios)
+    labels = meta["label"].to_numpy(dtype=np.int64)[row_ids]
+    sources = meta["source"].astype(str).to_numpy()[row_ids]
+    print(f"📊 {X.shape[0]:,} textos x {X.shape[1]:,} features, fontes: {sorted(set(sources))}")
+
+    # --- Leave-one-source-out (um processo por fold) ---
+    print("⚙️  Avaliação leave-one-source-out...")
+    results = run_folds(features, labels, sources, n_epochs=n_epochs, max_workers=max_workers)
+
+    # queda de desempenho: mesma fonte vista no treino (in_domain) vs. fonte deixada de fora
+    loso = results[results["fold"] != "in_domain"].set_index("source")
+    in_domain = results[results["fold"] == "in_domain"].set_index("source")
+    for metric in ("f1", "roc_auc"):
+        loso[f"{metric}_in_domain"] = in_domain[metric].reindex(loso.index)
+        loso[f"{metric}_drop"] = loso[f"{metric}_in_domain"] - loso[metric]
+    summary = loso.reset_index()
+
+    ensure_dir(METRICS)
+    save_csv(results, METRICS / f"classifier_folds_{features}.csv")
+    save_csv(summary, METRICS / f"classifier_loso_{features}.csv")
+    with open(METRICS / f"classifier_loso_{features}.json", "w", encoding="utf-8") as f:
+        json.dump(json.loads(summary.to_json(orient="records")), f, indent=2, ensure_ascii=False)
+    cols = ["source", "n", "positive_rate", "f1", "f1_in_domain", "f1_drop", "roc_auc"]
+    print(summary[cols].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    # --- Modelo final com todas as fontes (usado pelo scoring) ---
+    registry = get_registry()
+    # conteúdo completo da matriz (data, indices, indptr): um vetorizador reajustado que mantenha
+    # o número de termos por linha não pode reaproveitar o modelo antigo
+    input_hash = hash_inputs(X, row_ids, labels, features)
+    params = {"model": "sgd_log_loss", "features": features, "n_epochs": n_epochs}
+    if registry.find(f"sgd_{features}", params, input_hash) is None:
+        with span("09.fit[all]", rows=X.shape[0] * n_epochs):
+            clf = train_incremental(X, labels, np.arange(X.shape[0]), n_epochs=n_epochs)
+        registry.save(f"sgd_{features}", clf, input_hash, params=params,
+                      extra={"features": features, "loso_f1": dict(zip(summary["source"], summary["f1"]))})
+    print(f"💾 Métricas salvas em {METRICS} e modelo registrado como 'sgd_{features}'")
+    print("🎉 Classificador treinado e avaliado!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classificador SGD out-of-core com avaliação leave-one-source-out.")
+    parser.add_argument("--features", choices=BACKENDS, default="tfidf",
+                        help="Features persistidas pela etapa 03 (tfidf ou charhash).")
+    parser.add_argument("--epochs", type=int, default=N_EPOCHS, help="Passadas sobre os dados de treino.")
+    parser.add_argument("--workers", type=int, default=None, help="Processos para os folds (padrão: nº de CPUs).")
+    args = parser.parse_args()
+    run(features=args.features, n_epochs=args.epochs, max_workers=args.workers)
@@ -0,0 +1,128 @@
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import json
+import numpy as np
+import pandas as pd
+from src.classify import feature_vectorizer_version, load_features
+from src.cluster import (N_CLUSTERS, cluster_name, composition, fit_svd, group_sums, make_kmeans,
+                         make_svd, predict_blocks, svd_embedding, top_terms)
+from src.data_io import ensure_dir, save_csv
+from src.instrument import span, stage
+from src.registry import get_registry, hash_inputs
+
+PROC = Path("data/processed")
+CLUSTERS = PROC / "clusters"
+BACKENDS = ("tfidf", "charhash")
+
+def cluster_top_terms(full_ids, n_clusters, top_n=10):
+    """Termos característicos de cada cluster, a partir da matriz TF-IDF (vocabulário conhecido)."""
+    registry = get_registry()
+    try:
+        X, row_ids = load_features("tfidf")
+    except FileNotFoundError:
+        print("⚠️ Features TF-IDF não encontradas, clusters sem termos principais.")
+        return [[] for _ in range(n_clusters)]
+    # o vocabulário tem que ser o do vetorizador que gerou a matriz, não só ter o mesmo tamanho
+    version = feature_vectorizer_version("tfidf")
+    if version is None:
+        print("⚠️ Matriz TF-IDF sem a versão do vetorizador (rode a etapa 03 de novo), pulando termos.")
+        return [[] for _ in range(n_clusters)]
+    terms = registry.load("tfidf", version).get_feature_names_out()
+    if len(terms) != X.shape[1]:
+        print("⚠️ Vocabulário TF-IDF do registro não corresponde à matriz persistida, pulando termos.")
+        return [[] for _ in range(n_clusters)]
+    with span("10.top_terms", rows=X.shape[0]):
+        sums, counts = group_sums(X, full_ids[row_ids], n_clusters)
+    return top_terms(sums, counts, terms, top_n)
+
+@stage("10_clusters")
+def run(features="tfidf", n_clusters=N_CLUSTERS):
+    """Clusteriza o embedding SVD dos textos e resume cada cluster (classe, fonte e termos)."""
+    print(f"🚀 Clusterizando o espaço de embeddings (features: {features}, k={n_clusters})...")
+    X, row_ids = load_features(features)
+    with span("10.read") as sp:
+        meta = pd.read_csv(PROC / "unified_with_features.csv", usecols=["label", "source"])
+        sp["rows"] = len(meta)
+
+    registry = get_registry()
+    suffix = "" if features == "tfidf" else f"_{features}"
+    X_hash = hash_inputs(X, row_ids, features)  # conteúdo completo, não só indptr
+
+    # --- Embedding SVD (ajustado em amostra, aplicado em blocos) ---
+    svd = make_svd()
+    svd_version = registry.version_key(svd, X_hash)
+    with span("10.svd", rows=X.shape[0]):
+        # só o embedding é usado: basta saber que a versão existe, sem carregar o SVD
+        if registry.find(f"svd50{suffix}", svd, X_hash) is not None:
+            E = registry.load_array(f"svd50{suffix}", "embedding", svd_version)
+            print("   (embedding SVD reaproveitado do registro de modelos)")
+        else:
+            svd = fit_svd(svd, X)
+            E = svd_embedding(svd, X)
+            registry.save(f"svd50{suffix}", svd, X_hash, arrays={"embedding": E})
+    print(f"📊 Embedding SVD: {E.shape}")
+
+    # --- Mini-batch k-means ---
+    km = make_kmeans(n_clusters)
+    E_hash = hash_inputs(X_hash, svd_version)
+    with span("10.kmeans", rows=len(E)):
+        cached = registry.lookup(f"kmeans{suffix}", km, E_hash)
+        if cached is not None:
+            km = cached
+        else:
+            km.fit(E)
+            registry.save(f"kmeans{suffix}", km, E_hash)
+        ids = predict_blocks(km, E)
+
+    # id do cluster por linha de unified_with_features.csv (-1 = texto sem features)
+    full_ids = np.full(len(meta), -1, dtype=np.int16)
+    full_ids[row_ids] = ids
+
+    # --- Resumo de cada cluster ---
+    with span("10.summary", rows=len(ids)):
+        labels = meta["label"].to_numpy()[row_ids]
+        sources = meta["source"].astype(str).to_numpy()[row_ids]
+        by_label = composition(ids, labels, n_clusters)
+        by_source = composition(ids, sources, n_clusters)
+    terms = cluster_top_terms(full_ids, n_clusters)
+
+    size = by_label.sum(axis=1).to_numpy()
+    summary = pd.DataFrame({
+        "cluster": [cluster_name(c) for c in range(n_clusters)],
+        "size": size,
+        "share_ideacao": by_label.get("1", 0) / np.maximum(size, 1),
+        "dominant_source": by_source.idxmax(axis=1),
+        "dominant_source_share": by_source.max(axis=1) / np.maximum(size, 1),
+        "top_terms": [", ".join(t) for t in terms],
+    })
+    for col in by_source.columns:
+        summary[f"n_{col}"] = by_source[col].to_numpy()
+
+    ensure_dir(CLUSTERS)
+    np.save(CLUSTERS / "cluster_ids.npy", full_ids)
+    save_csv(summary, CLUSTERS / "cluster_summary.csv")
+    with open(CLUSTERS / "clusters.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "features": features,
+            "n_clusters": n_clusters,
+            "svd_version": svd_version,
+            "kmeans_version": registry.latest(f"kmeans{suffix}"),
+            "clusters": json.loads(summary.assign(top_terms=terms).to_json(orient="records")),
+        }, f, indent=2, ensure_ascii=False)
+
+    print(summary[["cluster", "size", "share_ideacao", "dominant_source", "top_terms"]]
+          .to_string(index=False, float_format=lambda v: f"{v:.2f}", max_colwidth=60))
+    print(f"💾 Clusters salvos em {CLUSTERS}")
+    print("🎉 Clusterização concluída!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clusterização (mini-batch k-means) do embedding SVD.")
+    parser.add_argument("--features", choices=BACKENDS, default="tfidf",
+                        help="Features persistidas pela etapa 03 usadas no embedding.")
+    parser.add_argument("--k", type=int, default=N_CLUSTERS, help="Número de clusters.")
+    args = parser.parse_args()
+    run(features=args.features, n_clusters=args.k)
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+from src.classify import feature_vectorizer_version, load_features
+from src.cluster import cluster_name
+from src.instrument import span, stage
+from src.registry import get_registry
+from src.termstats import STATS_DIR, TermStats, build_term_stats, make_counter
+from src.textstore import TextStore
+from src.vectorize import iter_csr_rows
+
+PROC = Path("data/processed")
+CLUSTERS = PROC / "clusters"
+
+def make_groupings(meta, row_ids):
+    """Código do grupo de cada linha da matriz TF-IDF em cada agrupamento (-1 = fora)."""
+    labels = meta["label"].to_numpy()[row_ids]
+    sources = meta["source"].astype(str).to_numpy()[row_ids]
+    label_source = pd.Series(labels).astype(str).to_numpy() + "|" + sources
+    groupings = {}
+    for name, values in (("label", labels), ("source", sources), ("label_source", label_source)):
+        codes, names = pd.factorize(values, sort=True)
+        groupings[name] = (codes, [str(v) for v in names])
+
+    cluster_file = CLUSTERS / "cluster_ids.npy"
+    if cluster_file.exists():
+        ids = np.load(cluster_file)
+        if len(ids) == len(meta):
+            ids = ids[row_ids].astype(np.int64)
+            groupings["cluster"] = (ids, [cluster_name(c) for c in range(int(ids.max()) + 1)])
+        else:
+            print("⚠️ cluster_ids.npy não corresponde aos dados atuais (rode a etapa 10), pulando clusters.")
+    return groupings
+
+@stage("11_term_stats")
+def run():
+    print("🚀 Calculando estatísticas de termos por classe, fonte e cluster...")
+    X, row_ids = load_features("tfidf")
+    # o vetorizador que gerou a matriz (mesmo vocabulário), não o último registrado
+    version = feature_vectorizer_version("tfidf")
+    if version is None:
+        raise ValueError("Matriz TF-IDF sem a versão do vetorizador. Execute scripts/03_vectorize_project.py.")
+    tfidf = get_registry().load("tfidf", version)
+    terms = tfidf.get_feature_names_out()
+    if len(terms) != X.shape[1]:
+        raise ValueError("Vocabulário TF-IDF do registro não corresponde à matriz persistida. "
+                         "Execute scripts/03_vectorize_project.py.")
+    with span("11.read") as sp:
+        meta = pd.read_csv(PROC / "unified_with_features.csv", usecols=["label", "source"])
+        sp["rows"] = len(meta)
+    groupings = make_groupings(meta, row_ids)
+
+    # contagens brutas (tf, df) com o mesmo vocabulário do TF-IDF, bloco a bloco, a partir dos
+    # textos do text store; o TF-IDF vem da matriz persistida pela etapa 03
+    store = TextStore.open(PROC / "textstore")
+    counter = make_counter(tfidf)
+    blocks = ((idx, X_block, counter.transform(store.take(row_ids[idx])))
+              for idx, X_block in iter_csr_rows(X))
+    with span("11.stats", rows=X.shape[0]):
+        stats_meta = build_term_stats(blocks, groupings, terms, STATS_DIR)
+
+    stats = TermStats.open(STATS_DIR)
+    for name in stats.groupings:
+        print(f"📊 {name}: {len(stats.groups(name))} grupos")
+    print("🔎 Termos característicos de cada fonte (log-odds):")
+    for group in stats.groups("source"):
+        print(f"   {group}: {', '.join(stats.top('source', group, n=10)['termo'])}")
+    print(f"💾 Estatísticas de {stats_meta['n_terms']:,} termos salvas em {STATS_DIR}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime
+from src.bench import REPO_ROOT, git_commit, run_stage_isolated
+from src.config import RAW, BENCHMARKS
+from src.data_io import ensure_dir
+from src.pipeline import STAGES
+from src.synthetic import write_raw_corpus
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+def bench_size(n_rows, stages, seed, trace_python):
+    """Gera o corpus sintético em um diretório temporário e mede cada etapa em sequência."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix=f"stv_bench_{n_rows}_") as workdir:
+        t0 = time.perf_counter()
+        counts = write_raw_corpus(Path(workdir) / RAW, n_rows, seed=seed)
+        print(f"  -> Corpus sintético com {n_rows:,} linhas gerado em {time.perf_counter() - t0:.1f}s {counts}")
+
+        for stage_id in stages:
+            res = run_stage_isolated(stage_id, workdir, trace_python=trace_python)
+            res["rows"] = n_rows
+            res["rows_per_s"] = round(n_rows / res["wall_s"], 1) if res["wall_s"] else None
+            results.append(res)
+            if res["status"] != "ok":
+                print(f"❌ Etapa {stage_id} falhou com {n_rows:,} linhas:\n{res['error']}")
+                print("   Etapas seguintes dependem desta saída; pulando o restante deste tamanho.")
+                break
+            peak = f"{res['peak_rss_mb']:.0f} MB" if res["peak_rss_mb"] is not None else "n/d"
+            print(f"  ✅ {stage_id}: {res['wall_s']:.2f}s wall, {res['cpu_s']:.2f}s CPU, pico {peak}")
+    return results
+
+def compare(current, baseline_path):
+    """Imprime a razão de tempo e memória contra um JSON de benchmark anterior."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    base = {(r["rows"], r["stage"]): r for r in baseline["results"] if r["status"] == "ok"}
+    print(f"\n📈 Comparação com {baseline_path} (commit {baseline.get('commit')}):")
+    print(f"{'linhas':>10} {'etapa':>5} {'wall':>10} {'x wall':>8} {'pico MB':>9} {'x pico':>8}")
+    for r in current["results"]:
+        b = base.get((r["rows"], r["stage"]))
+        if r["status"] != "ok" or b is None:
+            continue
+        x_wall = r["wall_s"] / b["wall_s"] if b["wall_s"] else float("nan")
+        x_rss = r["peak_rss_mb"] / b["peak_rss_mb"] if r["peak_rss_mb"] and b["peak_rss_mb"] else float("nan")
+        peak = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        print(f"{r['rows']:>10,} {r['stage']:>5} {r['wall_s']:>9.2f}s {x_wall:>7.2f}x "
+              f"{peak:>9} {x_rss:>7.2f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do pipeline com corpora sintéticos.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Tamanhos do corpus sintético (linhas).")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES),
+                        help="Etapas a medir (padrão: todas); rodam sempre na ordem do pipeline.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--trace-python", action="store_true",
+                        help="Mede também o pico de alocações Python com tracemalloc (mais lento).")
+    parser.add_argument("--out", type=Path, default=None, help="Arquivo JSON de saída.")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON anterior para comparação.")
+    args = parser.parse_args(argv)
+    # cada etapa lê as saídas das anteriores: mede sempre na ordem do pipeline, sem repetir
+    stages = [s for s in STAGES if s in args.stages]
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "stages": stages,
+        "results": [],
+    }
+    print("⏱️  Iniciando benchmark do pipeline...")
+    for n_rows in args.sizes:
+        print(f"🧪 Tamanho: {n_rows:,} linhas")
+        report["results"].extend(bench_size(n_rows, stages, args.seed, args.trace_python))
+
+    out = args.out or BENCHMARKS / f"bench_{datetime.now():%Y%m%d_%H%M%S}_{commit}.json"
+    out = out if out.is_absolute() else REPO_ROOT / out
+    ensure_dir(out.parent)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados salvos em: {out}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+if __name__ == "__main__":
+    main()
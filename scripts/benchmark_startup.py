@@ -0,0 +1,124 @@
+"""
+Benchmark do tempo de partida da CLI e da importação das etapas.
+
+Cada medição roda em um processo Python novo. Falha (código de saída 1) quando:
+  - um comando da CLI (`--help`, `status`, `list`) passa do orçamento (--budget);
+  - importar o script de uma etapa carrega uma biblioteca pesada (HEAVY_MODULES), que deveria
+    ser importada só dentro da função que a usa.
+Com --numba, mede também `import umap` duas vezes com o cache persistente do numba
+(a segunda deve reaproveitar as compilações da primeira).
+"""
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from src.bench import REPO_ROOT, git_commit
+from src.config import BENCHMARKS
+from src.data_io import ensure_dir
+from src.pipeline import STAGES
+
+HEAVY_MODULES = ["umap", "numba", "pynndescent", "sklearn.manifold", "textblob", "wordcloud", "seaborn"]
+CLI_COMMANDS = [["--help"], ["status"], ["list"]]
+DEFAULT_BUDGET = 1.0  # segundos
+
+def time_subprocess(args, repeats):
+    """Mediana do tempo de parede de `python <args>` em processos novos (rodando na raiz do repo)."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=REPO_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+def probe_stage_import(stage_id):
+    """Importa o script da etapa em um processo novo e informa tempo e módulos pesados carregados."""
+    code = (
+        "import json, sys, time\n"
+        "t0 = time.perf_counter()\n"
+        "from src.pipeline import load_stage\n"
+        f"load_stage({stage_id!r})\n"
+        "elapsed = time.perf_counter() - t0\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'import_s': elapsed, 'heavy': heavy}))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+                         capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def probe_umap_import():
+    code = ("import time\nfrom src.config import use_numba_cache\nuse_numba_cache()\n"
+            "t0 = time.perf_counter()\nimport umap\nprint(time.perf_counter() - t0)\n")
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+                         capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de partida da CLI do pipeline.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="Tempo máximo (s) para --help, status e list.")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetições por comando (usa a mediana).")
+    parser.add_argument("--numba", action="store_true",
+                        help="Mede também `import umap` a frio e com o cache do numba (demora).")
+    parser.add_argument("--out", type=Path, default=None, help="Arquivo JSON de saída.")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "budget_s": args.budget,
+        "cli": [],
+        "stages": [],
+    }
+    failures = []
+
+    print("⏱️  Tempo de partida da CLI...")
+    for cmd in CLI_COMMANDS:
+        wall = time_subprocess(["run_pipeline.py", *cmd], args.repeats)
+        ok = wall <= args.budget
+        report["cli"].append({"command": " ".join(cmd), "wall_s": round(wall, 3), "ok": ok})
+        print(f"  {'✅' if ok else '❌'} run_pipeline.py {' '.join(cmd):<8} {wall:.3f}s")
+        if not ok:
+            failures.append(f"`run_pipeline.py {' '.join(cmd)}` levou {wall:.2f}s (orçamento {args.budget}s)")
+
+    print("📦 Importação dos scripts das etapas...")
+    for stage_id in STAGES:
+        res = probe_stage_import(stage_id)
+        report["stages"].append({"stage": stage_id, "import_s": round(res["import_s"], 3), "heavy": res["heavy"]})
+        print(f"  {'✅' if not res['heavy'] else '❌'} {stage_id}: {res['import_s']:.3f}s"
+              f"{'  importa ' + ', '.join(res['heavy']) if res['heavy'] else ''}")
+        if res["heavy"]:
+            failures.append(f"etapa {stage_id} importa {', '.join(res['heavy'])} ao ser carregada")
+
+    if args.numba:
+        print("🔥 import umap com cache do numba (1ª e 2ª execução)...")
+        first, second = probe_umap_import(), probe_umap_import()
+        report["numba"] = {"first_s": round(first, 2), "second_s": round(second, 2)}
+        print(f"  1ª: {first:.1f}s, 2ª: {second:.1f}s")
+
+    out = args.out or BENCHMARKS / f"startup_{datetime.now():%Y%m%d_%H%M%S}_{commit}.json"
+    out = out if out.is_absolute() else REPO_ROOT / out
+    ensure_dir(out.parent)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados salvos em: {out}")
+
+    if failures:
+        print("❌ Orçamento de partida violado:\n  - " + "\n  - ".join(failures))
+        return 1
+    print("🎉 Partida dentro do orçamento.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Cliente de carga para o serviço de scoring (localhost, sem dependências externas).
+
+    python scripts/scoring_load_test.py --start-server --requests 2000 --concurrency 32
+
+Dispara pedidos concorrentes (um texto por pedido, conexões keep-alive) e imprime a vazão e as
+latências medidas pelo cliente, seguidas das métricas do próprio serviço (/metrics).
+"""
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import asyncio
+import json
+import subprocess
+import time
+import numpy as np
+from src.synthetic import build_vocab, make_source
+
+async def request(reader, writer, host, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def client(host, port, texts, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for text in texts:
+            t0 = time.perf_counter()
+            status, _ = await request(reader, writer, host, "POST", "/score", {"text": text})
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def fetch(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await request(reader, writer, host, "GET", path)
+    finally:
+        writer.close()
+
+async def wait_ready(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, _ = await fetch(host, port, "/health")
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError(f"Serviço não respondeu em {timeout}s")
+
+async def run_load(args, texts):
+    await wait_ready(args.host, args.port, args.timeout)
+    latencies, errors = [], []
+    chunks = [texts[i::args.concurrency] for i in range(args.concurrency)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*[client(args.host, args.port, c, latencies, errors) for c in chunks])
+    elapsed = time.perf_counter() - t0
+    lat = np.array(latencies)
+    print(f"📊 Cliente: {len(lat):,} pedidos em {elapsed:.2f}s = {len(lat) / elapsed:.1f} pedidos/s | "
+          f"latência p50 {np.percentile(lat, 50):.1f} ms, p99 {np.percentile(lat, 99):.1f} ms | "
+          f"erros: {len(errors)}")
+    _, metrics = await fetch(args.host, args.port, "/metrics")
+    print(f"📈 Serviço: {json.dumps(metrics, ensure_ascii=False)}")
+    return 1 if errors else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de scoring.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--start-server", action="store_true",
+                        help="Sobe scripts/serve_scoring.py em um subprocesso durante o teste.")
+    parser.add_argument("--server-args", default="", help='Argumentos extras para o serviço (ex.: "--no-umap").')
+    parser.add_argument("--timeout", type=float, default=180, help="Espera máxima pelo serviço (s).")
+    args = parser.parse_args(argv)
+
+    vocab, probs = build_vocab(seed=0)
+    texts = make_source("DatasetC", args.requests, vocab, probs, seed=1)["tweet"].tolist()
+
+    proc = None
+    if args.start_server:
+        cmd = [sys.executable, str(Path(__file__).with_name("serve_scoring.py")),
+               "--host", args.host, "--port", str(args.port), *args.server_args.split()]
+        proc = subprocess.Popen(cmd)
+    try:
+        return asyncio.run(run_load(args, texts))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+if __name__ == "__main__":
+    sys.exit(main())
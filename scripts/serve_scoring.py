@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+# Adiciona o diretório raiz do projeto ao sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import asyncio
+from src.serving import MAX_BATCH, WINDOW_MS, serve
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de scoring de textos (micro-lotes).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Processos de scoring (cada um carrega os modelos).")
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS, help="Janela de agrupamento dos pedidos.")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="Máximo de textos por lote.")
+    parser.add_argument("--no-umap", action="store_true",
+                        help="Não calcula coordenadas UMAP (partida e scoring bem mais rápidos).")
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Carregando modelos em {args.workers} worker(s)...")
+    ready = lambda srv: print(f"✅ Servindo em http://{args.host}:{args.port} "
+                              f"(janela {args.window_ms} ms, lote até {args.max_batch} textos)", flush=True)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.window_ms, args.max_batch,
+                          with_umap=not args.no_umap, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    print("👋 Serviço encerrado.")
+
+if __name__ == "__main__":
+    main()
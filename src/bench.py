@@ -0,0 +1,89 @@
+"""
+Medição de tempo e memória das etapas do pipeline.
+Cada etapa roda em um processo novo (spawn), para que o pico de RSS seja só dela.
+No Windows (sem o módulo `resource`) o pico de RSS não é medido e o tempo de CPU dos
+processos filhos da etapa fica de fora.
+"""
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from src import instrument
+from src.config import RAW, PROCESSED, FIGS, REPORTS
+from src.pipeline import STAGES, load_stage
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _rusage_children():
+    """CPU (s) e pico de RSS dos processos filhos já encerrados; (0, None) sem `resource`."""
+    if resource is None:
+        return 0.0, None
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ru.ru_utime + ru.ru_stime, ru.ru_maxrss
+
+def _stage_worker(stage_id, workdir, trace_python=False):
+    """Executa uma etapa dentro de workdir e devolve as métricas (roda no processo filho)."""
+    os.chdir(workdir)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+    t_import = time.perf_counter()
+    module = load_stage(stage_id)
+    # o relatório (07) usa caminhos absolutos a partir do repositório; aponta para o workdir
+    for name, path in {"RAW": RAW, "PROC": PROCESSED, "FIGS": FIGS, "REPORTS": REPORTS}.items():
+        if hasattr(module, name):
+            setattr(module, name, path)
+    entry = getattr(module, STAGES[stage_id][1])
+    import_s = time.perf_counter() - t_import
+
+    if trace_python:
+        tracemalloc.start()
+    cpu_children0, _ = _rusage_children()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    status, error = "ok", None
+    try:
+        entry()
+    except Exception:
+        status, error = "error", traceback.format_exc()
+    wall = time.perf_counter() - wall0
+    cpu_children1, maxrss_children = _rusage_children()
+    cpu = time.process_time() - cpu0 + (cpu_children1 - cpu_children0)
+    py_peak = tracemalloc.get_traced_memory()[1] if trace_python else None
+    if trace_python:
+        tracemalloc.stop()
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else None  # KB no Linux
+    return {
+        "stage": stage_id,
+        "status": status,
+        "error": error,
+        "import_s": round(import_s, 4),
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "peak_rss_mb": round(max(maxrss, maxrss_children) / 1024, 1) if maxrss is not None else None,
+        "py_peak_mb": round(py_peak / 2**20, 1) if py_peak is not None else None,
+        "spans": instrument.records(),  # sub-etapas registradas pela instrumentação
+    }
+
+def run_stage_isolated(stage_id, workdir, trace_python=False):
+    """Roda a etapa em um processo filho novo e retorna o dicionário de métricas."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as ex:
+        return ex.submit(_stage_worker, stage_id, str(workdir), trace_python).result()
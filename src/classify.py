@@ -0,0 +1,141 @@
+"""
+Classificador linear incremental (SGD) treinado direto sobre as matrizes de features
+persistidas pela etapa 03, sem carregá-las inteiras na memória.
+
+A matriz é aberta com mmap e percorrida em blocos de linhas (`partial_fit` bloco a bloco),
+então o pico de memória depende do tamanho do bloco, não do corpus. A avaliação
+leave-one-source-out treina sem uma das fontes e avalia nela; cada fold roda em um processo.
+
+    X, row_ids = load_features("tfidf")
+    results = run_folds("tfidf", labels, sources)
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.utils.class_weight import compute_class_weight
+from src import instrument
+from src.config import PROCESSED
+from src.instrument import span
+from src.vectorize import iter_csr_rows, load_csr
+
+FEATURES = PROCESSED / "features"
+CLASSES = np.array([0, 1])
+BLOCK_ROWS = 20_000
+N_EPOCHS = 3
+HOLDOUT_FRAC = 0.2  # fold "in_domain": amostra aleatória de todas as fontes, para comparação
+
+def load_features(backend, features_dir: Path = FEATURES):
+    """Matriz CSR mapeada em memória e a posição de cada linha em unified_with_features.csv."""
+    feat_dir = Path(features_dir) / backend
+    if not (feat_dir / "X" / "meta.json").exists():
+        raise FileNotFoundError(f"Features '{backend}' não encontradas em {feat_dir}. "
+                                f"Execute scripts/03_vectorize_project.py --features {backend}.")
+    return load_csr(feat_dir / "X"), np.load(feat_dir / "row_ids.npy")
+
+def feature_vectorizer_version(backend, features_dir: Path = FEATURES):
+    """Versão, no registro, do vetorizador que gerou a matriz persistida (None se não registrada)."""
+    path = Path(features_dir) / backend / "vectorizer.json"
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["version"]
+
+def make_classifier(class_weight=None, seed=42):
+    """Regressão logística via SGD (log_loss dá probabilidades para AUC e para o scoring)."""
+    return SGDClassifier(loss="log_loss", alpha=1e-5, class_weight=class_weight, random_state=seed)
+
+def train_incremental(X, y, rows, n_epochs=N_EPOCHS, block_rows=BLOCK_ROWS, seed=42):
+    """
+    Treina com partial_fit em blocos das linhas `rows`, em ordem aleatória a cada época.
+    Os pesos de classe compensam o desbalanceamento (equivalente a class_weight="balanced").
+    """
+    weights = compute_class_weight("balanced", classes=CLASSES, y=y[rows])
+    clf = make_classifier({int(c): float(w) for c, w in zip(CLASSES, weights)}, seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(n_epochs):
+        order = rng.permutation(rows)
+        for start in range(0, len(order), block_rows):
+            # dentro do bloco, linhas em ordem crescente: leitura sequencial do arquivo mapeado
+            idx = np.sort(order[start:start + block_rows])
+            clf.partial_fit(X[idx], y[idx], classes=CLASSES)
+    return clf
+
+def predict_proba(clf, X, rows, block_rows=BLOCK_ROWS):
+    """Probabilidade da classe 1 para as linhas `rows`, calculada bloco a bloco."""
+    out = np.empty(len(rows), dtype=np.float64)
+    pos = 0
+    for idx, block in iter_csr_rows(X, block_rows, rows=rows):
+        out[pos:pos + len(idx)] = clf.predict_proba(block)[:, 1]
+        pos += len(idx)
+    return out
+
+def binary_metrics(y_true, proba, threshold=0.5):
+    y_pred = (proba >= threshold).astype(np.int64)
+    both = len(np.unique(y_true)) == 2
+    return {
+        "n": int(len(y_true)),
+        "positive_rate": float(y_true.mean()) if len(y_true) else float("nan"),
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred, zero_division=0),
+        "recall": recall_score(y_true, y_pred, zero_division=0),
+        "f1": f1_score(y_true, y_pred, zero_division=0),
+        # AUC só é definida quando a fonte tem as duas classes
+        "roc_auc": roc_auc_score(y_true, proba) if both else float("nan"),
+    }
+
+def fold_rows(fold, sources, seed=42):
+    """Linhas de treino e de teste de um fold: nome de uma fonte (deixada de fora) ou "in_domain"."""
+    all_rows = np.arange(len(sources))
+    if fold == "in_domain":
+        test = np.random.default_rng(seed).random(len(sources)) < HOLDOUT_FRAC
+    else:
+        test = sources == fold
+    return all_rows[~test], all_rows[test]
+
+def run_fold(backend, fold, labels, sources, n_epochs=N_EPOCHS, seed=42, features_dir: Path = FEATURES):
+    """
+    Treina e avalia um fold. Devolve uma linha de métricas por fonte presente no teste
+    (no fold "in_domain", todas; nos demais, só a fonte deixada de fora).
+    """
+    X, _ = load_features(backend, features_dir)
+    train, test = fold_rows(fold, sources, seed)
+    with span(f"09.fit[{fold}]", rows=len(train) * n_epochs):
+        clf = train_incremental(X, labels, train, n_epochs=n_epochs, seed=seed)
+    with span(f"09.eval[{fold}]", rows=len(test)):
+        proba = predict_proba(clf, X, test)
+    results = []
+    for source in np.unique(sources[test]):
+        mask = sources[test] == source
+        results.append({"fold": fold, "source": source, "n_train": int(len(train)),
+                        **binary_metrics(labels[test][mask], proba[mask])})
+    return results
+
+def _run_fold_worker(*args):
+    results = run_fold(*args)
+    return results, instrument.drain()
+
+def run_folds(backend, labels, sources, folds=None, n_epochs=N_EPOCHS, seed=42,
+              max_workers=None, features_dir: Path = FEATURES):
+    """
+    Roda os folds (padrão: um por fonte + "in_domain") em processos separados; cada processo
+    abre a matriz com mmap, então as páginas do arquivo são compartilhadas pelo sistema.
+    """
+    labels, sources = np.asarray(labels), np.asarray(sources)
+    folds = folds or [*pd.unique(sources), "in_domain"]
+    args = [(backend, fold, labels, sources, n_epochs, seed, features_dir) for fold in folds]
+    max_workers = max_workers or min(len(folds), os.cpu_count() or 1)
+    if max_workers <= 1:
+        results = [run_fold(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=instrument.worker_init) as ex:
+            outputs = list(ex.map(_run_fold_worker, *zip(*args)))
+        results = []
+        for res, recs in outputs:
+            instrument.merge(recs)
+            results.append(res)
+    return pd.DataFrame([row for res in results for row in res])
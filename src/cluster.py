@@ -0,0 +1,98 @@
+"""
+Clusterização do espaço de embeddings (SVD) para dar nome aos "continentes" do UMAP.
+
+    E = svd_embedding(svd, X)                 # n x 50, float32, normalizado (similaridade cosseno)
+    km = make_kmeans(n_clusters=10).fit(E)
+    cluster_ids = predict_blocks(km, E)
+
+O SVD é ajustado em uma amostra de linhas e aplicado em blocos; o k-means é mini-batch.
+Assim o custo cresce linearmente com o corpus e a memória fica limitada ao embedding denso.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+from src.vectorize import CHUNK_ROWS, iter_csr_rows
+
+N_COMPONENTS = 50
+N_CLUSTERS = 10
+SVD_FIT_ROWS = 200_000  # linhas usadas para ajustar o SVD (o transform vale para todas)
+
+def make_svd(n_components=N_COMPONENTS, seed=42):
+    return TruncatedSVD(n_components=n_components, random_state=seed)
+
+def fit_svd(svd, X, max_rows=SVD_FIT_ROWS, seed=42):
+    """Ajusta o SVD em até `max_rows` linhas sorteadas de X."""
+    rows = np.arange(X.shape[0])
+    if len(rows) > max_rows:
+        rows = np.sort(np.random.default_rng(seed).choice(rows, max_rows, replace=False))
+    return svd.fit(X[rows])
+
+def svd_embedding(svd, X, block_rows=CHUNK_ROWS):
+    """Embedding denso (float32) de todas as linhas, calculado em blocos e normalizado (L2)."""
+    E = np.empty((X.shape[0], svd.n_components), dtype=np.float32)
+    for idx, block in iter_csr_rows(X, block_rows):
+        E[idx] = normalize(svd.transform(block))
+    return E
+
+def make_kmeans(n_clusters=N_CLUSTERS, seed=42):
+    from sklearn.cluster import MiniBatchKMeans  # sklearn.cluster importa sklearn.manifold (lento)
+    return MiniBatchKMeans(n_clusters=n_clusters, batch_size=4096, n_init=3, random_state=seed)
+
+def predict_blocks(km, E, block_rows=CHUNK_ROWS * 10):
+    """Cluster de cada linha do embedding (int16), em blocos para não duplicar E na memória."""
+    out = np.empty(len(E), dtype=np.int16)
+    for start in range(0, len(E), block_rows):
+        out[start:start + block_rows] = km.predict(np.asarray(E[start:start + block_rows]))
+    return out
+
+def composition(cluster_ids, values, n_clusters):
+    """Tabela cluster x valor (contagens) via bincount, sem groupby."""
+    codes, uniques = pd.factorize(np.asarray(values), sort=True)
+    flat = cluster_ids.astype(np.int64) * len(uniques) + codes
+    counts = np.bincount(flat, minlength=n_clusters * len(uniques)).reshape(n_clusters, len(uniques))
+    return pd.DataFrame(counts, columns=[str(u) for u in uniques])
+
+# --- Termos característicos de cada cluster (agregação esparsa) ---
+# A matriz indicadora G (n_grupos x n_textos, um 1 por coluna) soma as linhas de X de cada
+# grupo com um único produto G @ X, sem groupby nem matriz densa; com X mapeado em memória,
+# a soma é feita em blocos de linhas.
+
+def group_indicator(codes, n_groups=None):
+    """Matriz CSR (n_grupos x n) com G[g, i] = 1 quando codes[i] == g (códigos < 0 ficam de fora)."""
+    codes = np.asarray(codes, dtype=np.int64)
+    n_groups = int(codes.max()) + 1 if n_groups is None else n_groups
+    cols = np.flatnonzero(codes >= 0)
+    return sp.csr_matrix((np.ones(len(cols), dtype=np.float64), (codes[cols], cols)),
+                         shape=(n_groups, len(codes)))
+
+def group_sums(X, codes, n_groups=None, block_rows=CHUNK_ROWS):
+    """
+    Soma de X por grupo (denso, n_grupos x n_features) e número de linhas de cada grupo.
+    `codes` tem um código de grupo por linha de X (negativo = ignorar).
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    n_groups = int(codes.max()) + 1 if n_groups is None else n_groups
+    sums = np.zeros((n_groups, X.shape[1]), dtype=np.float64)
+    for idx, block in iter_csr_rows(X, block_rows):
+        sums += (group_indicator(codes[idx], n_groups) @ block).toarray()
+    counts = np.bincount(codes[codes >= 0], minlength=n_groups)
+    return sums, counts
+
+def top_terms(sums, counts, terms, top_n=10):
+    """
+    Termos mais característicos de cada grupo: peso médio no grupo vezes o log da razão
+    para o peso médio no corpus (contribuição à divergência KL), que favorece termos ao mesmo
+    tempo frequentes no grupo e raros fora dele.
+    """
+    terms = np.asarray(terms)
+    eps = 1e-9
+    mean_all = sums.sum(axis=0) / max(counts.sum(), 1)
+    mean_group = sums / np.maximum(counts, 1)[:, None]
+    score = mean_group * np.log((mean_group + eps) / (mean_all + eps))
+    top = np.argsort(-score, axis=1)[:, :top_n]
+    return [terms[row].tolist() for row in top]
+
+def cluster_name(c):
+    return f"C{int(c):02d}"
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 DATA = Path("data")
 RAW = DATA / "raw"
@@ -5,3 +6,43 @@ INTERIM = DATA / "interim"
 PROCESSED = DATA / "processed"
 REPORTS = Path("reports")
 FIGS = REPORTS / "figures"
+BENCHMARKS = REPORTS / "benchmarks"
+METRICS = REPORTS / "metrics"
+NUMBA_CACHE = DATA / ".numba_cache"
+
+def use_numba_cache():
+    """
+    Persiste as compilações JIT do numba (UMAP/pynndescent) entre execuções.
+    Precisa ser chamado antes do primeiro `import umap`.
+    """
+    os.environ.setdefault("NUMBA_CACHE_DIR", str(NUMBA_CACHE.resolve()))
+
+# --- Configuração dos Datasets ---
+# Adicione ou modifique esta lista para incluir novos datasets.
+# Você precisa especificar o nome do arquivo e os nomes das colunas de texto e rótulo.
+DATASET_CONFIG = [
+    {
+        "filename": "Suicide_Detection.csv",
+        "text_col": "text",
+        "label_col": "class",
+        "source_name": "DatasetA"
+    },
+    {
+        "filename": "Suicide_Ideation_Dataset(Twitter-based).csv",
+        "text_col": "Tweet",
+        "label_col": "Suicide",
+        "source_name": "DatasetB"
+    },
+    {
+        "filename": "twitter-suicidal_data.csv",
+        "text_col": "tweet",         # ATENÇÃO: Verifique se o nome da coluna de texto é 'tweet'
+        "label_col": "intention",    # ATENÇÃO: Verifique se o nome da coluna de rótulo é 'intention'
+        "source_name": "DatasetC"
+    },
+    {
+        "filename": "data_raw_translated_en.csv",
+        "text_col": "traducido",
+        "label_col": "class",
+        "source_name": "DatasetD"
+    }
+]
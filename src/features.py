@@ -1,3 +1,5 @@
+import pandas as pd
+
 def build_numeric_features(s):
     """
     Gera métricas simples a partir de um texto.
@@ -20,3 +22,25 @@ def build_numeric_features(s):
         "n_url_like": int(("http" in s) or ("www" in s)),
         "upper_ratio": (sum(c.isupper() for c in s) + 1) / (len(s) + 1)
     }
+
+def numeric_features_frame(texts) -> pd.DataFrame:
+    """
+    Mesmas métricas de build_numeric_features para uma sequência de textos, com as
+    operações de string do pandas (uma passada por coluna em vez de um dict por texto).
+    """
+    # mesma conversão de build_numeric_features: None -> "", outros tipos -> str(valor)
+    s = pd.Series([t if isinstance(t, str) else "" if t is None else str(t) for t in texts], dtype=object)
+    length = s.str.len()
+    # maiúsculas: regex vetorizada nos textos ASCII; str.isupper (Unicode) só nos demais
+    ascii_ = s.map(str.isascii).astype(bool)  # Series.str.isascii só existe no pandas >= 3.0
+    n_upper = s.str.count("[A-Z]")
+    n_upper[~ascii_] = s[~ascii_].map(lambda t: sum(map(str.isupper, t)))
+    return pd.DataFrame({
+        "len": length,
+        "n_hash": s.str.count("#"),
+        "n_mention": s.str.count("@"),
+        "n_exc": s.str.count("!"),
+        "n_q": s.str.count(r"\?"),
+        "n_url_like": (s.str.contains("http", regex=False) | s.str.contains("www", regex=False)).astype(int),
+        "upper_ratio": (n_upper + 1) / (length + 1),
+    }).reset_index(drop=True)
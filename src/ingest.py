@@ -0,0 +1,143 @@
+"""
+Leitura e padronização de cada fonte de DATASET_CONFIG.
+As funções são independentes por fonte para poderem rodar em processos separados.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src import instrument
+from src.instrument import span
+from src.text_clean import basic_clean
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"  # leitura multi-thread, bem mais rápida em arquivos grandes
+except ImportError:
+    CSV_ENGINE = "c"
+
+# --- Mapeamento ampliado de rótulos ---
+LABEL_MAP = {
+    "suicide": 1,
+    "non-suicide": 0,
+    "Suicide": 1,
+    "Non-Suicide": 0,
+    "Suicide post": 1,
+    "Not Suicide post": 0,
+    "Potential Suicide post": 1,
+    "Suicide-related": 1,
+    "Not Suicide-related": 0,
+    "Yes": 1,
+    "No": 0,
+    1: 1,
+    0: 0
+}
+
+def _map_label(x):
+    """Retorna (rótulo, reconhecido). Valores não reconhecidos viram 0."""
+    if isinstance(x, str):
+        x = x.strip()
+        if x in LABEL_MAP:
+            return LABEL_MAP[x], True
+        return 0, False
+    elif pd.notna(x):
+        try:
+            return int(x), True
+        except (TypeError, ValueError, OverflowError):
+            return 0, False
+    return 0, False
+
+def normalize_label(x):
+    """Normaliza os valores de rótulo para 0 ou 1."""
+    return _map_label(x)[0]
+
+def normalize_labels(values):
+    """
+    Versão vetorizada de normalize_label: cada valor distinto é mapeado uma única vez
+    (factorize + tabela de consulta pelos códigos).
+    Retorna (array de rótulos, {valor desconhecido: contagem}).
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = [_map_label(u) for u in uniques]
+    # a última posição da tabela atende o código -1 (valores ausentes)
+    lut = np.array([lab for lab, _ in mapped] + [0], dtype=np.int64)
+    labels = lut[codes]
+
+    counts = np.bincount(codes + 1, minlength=len(uniques) + 1)
+    unknown = {str(u): int(counts[i + 1]) for i, (u, (_, ok)) in enumerate(zip(uniques, mapped)) if not ok}
+    if counts[0]:
+        unknown["<vazio>"] = int(counts[0])
+    return labels, unknown
+
+def read_source(filepath: Path, config):
+    """
+    Lê só as colunas de texto e rótulo de um arquivo.
+    Retorna None (após imprimir o erro) se alguma coluna configurada não existir.
+    """
+    # --- Validação das colunas ---
+    # Lê apenas o cabeçalho para verificar se as colunas configuradas existem
+    columns = list(pd.read_csv(filepath, nrows=0).columns)
+    required_cols = [config["text_col"], config["label_col"]]
+    missing_cols = [col for col in required_cols if col not in columns]
+
+    if missing_cols:
+        print(f"❌ Erro em '{config['filename']}': Coluna(s) não encontrada(s): {missing_cols}.")
+        print(f"   Colunas disponíveis no arquivo: {columns}")
+        print("   Por favor, corrija 'text_col' ou 'label_col' na configuração DATASET_CONFIG e tente novamente.")
+        return None
+
+    return pd.read_csv(filepath, usecols=required_cols, engine=CSV_ENGINE)
+
+def process_source(config, raw_dir: Path):
+    """Lê, valida, normaliza rótulos e limpa os textos de uma fonte."""
+    filepath = Path(raw_dir) / config["filename"]
+    if not filepath.exists():
+        print(f"⚠️  Aviso: Arquivo '{config['filename']}' não encontrado. Pulando.")
+        return None
+
+    print(f"  -> Processando '{config['filename']}'...")
+    with span(f"01.read[{config['source_name']}]") as sp:
+        temp_df = read_source(filepath, config)
+        sp["rows"] = 0 if temp_df is None else len(temp_df)
+    if temp_df is None:
+        return None
+
+    # Renomear colunas para o padrão ('text', 'label')
+    temp_df = temp_df.rename(columns={
+        config["text_col"]: "text",
+        config["label_col"]: "label"
+    })
+
+    temp_df["source"] = config["source_name"]
+    with span(f"01.labels[{config['source_name']}]", rows=len(temp_df)):
+        temp_df["label"], unknown = normalize_labels(temp_df["label"])
+    if unknown:
+        print(f"⚠️  Rótulos desconhecidos em '{config['filename']}' (mapeados para 0): {unknown}")
+
+    # --- limpeza simples dos textos ---
+    with span(f"01.clean[{config['source_name']}]", rows=len(temp_df)):
+        temp_df["text"] = temp_df["text"].astype(str).str.strip()
+        temp_df["text_clean"] = temp_df["text"].map(basic_clean)
+    return temp_df[["text", "label", "source", "text_clean"]]
+
+def _process_source_worker(config, raw_dir):
+    df = process_source(config, raw_dir)
+    return df, instrument.drain()
+
+def process_sources(configs, raw_dir: Path, max_workers=None):
+    """
+    Processa as fontes em paralelo, uma por processo, e devolve os DataFrames
+    na mesma ordem de `configs` (fontes ausentes ou inválidas ficam de fora).
+    """
+    max_workers = max_workers or min(len(configs), os.cpu_count() or 1)
+    if max_workers <= 1 or len(configs) <= 1:
+        dfs = [process_source(config, raw_dir) for config in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=instrument.worker_init) as ex:
+            results = list(ex.map(_process_source_worker, configs, [raw_dir] * len(configs)))
+        dfs = []
+        for df, recs in results:
+            instrument.merge(recs)
+            dfs.append(df)
+    return [df for df in dfs if df is not None]
@@ -0,0 +1,201 @@
+"""
+Instrumentação leve das etapas: tempo de parede/CPU, linhas processadas, linhas/s e memória.
+
+Uso:
+    with span("03.tfidf", rows=len(df)):
+        X = tfidf.fit_transform(...)
+
+    @stage("03_vectorize")
+    def run(): ...
+
+Cada span é gravado como uma linha JSON em reports/logs/run_<id>.jsonl. Quando o span mais
+externo aberto por `stage` termina, uma tabela-resumo é impressa. Variáveis de ambiente:
+    STV_LOG_DIR   diretório dos logs (padrão: reports/logs)
+    STV_RUN_ID    identificador da execução (compartilhado entre processos do mesmo run)
+    STV_PROFILE   "cprofile", "tracemalloc" ou ambos separados por vírgula
+"""
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from src.config import REPORTS
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, a memória fica fora das métricas
+    resource = None
+
+LOG_DIR = Path(os.environ.get("STV_LOG_DIR", REPORTS / "logs"))
+RUN_ID = os.environ.get("STV_RUN_ID") or f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+PROFILE = {p.strip() for p in os.environ.get("STV_PROFILE", "").split(",") if p.strip()}
+os.environ.setdefault("STV_RUN_ID", RUN_ID)  # processos filhos gravam no mesmo log
+
+
+_records = []   # spans finalizados neste processo
+_stack = []     # spans abertos (para aninhamento)
+_profiler_active = False
+_in_worker = False  # em processos de pool o resumo fica a cargo do processo principal
+
+def _peak_rss_mb():
+    """Pico de RSS do processo, ou None onde não há `resource` (Windows)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # bytes no macOS, KB no Linux
+
+def _rss_mb():
+    """RSS atual; cai para o pico quando /proc não está disponível (None se nenhum dos dois)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return _peak_rss_mb()
+
+def configure(log_dir=None, run_id=None, profile=None):
+    """Altera destino dos logs, id da execução ou perfis ativos (equivalente às variáveis de ambiente)."""
+    global LOG_DIR, RUN_ID, PROFILE
+    if log_dir is not None:
+        LOG_DIR = Path(log_dir)
+    if run_id is not None:
+        RUN_ID = run_id
+    if profile is not None:
+        PROFILE = set(profile)
+
+def log_path():
+    return LOG_DIR / f"run_{RUN_ID}.jsonl"
+
+def _write(record):
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    with open(log_path(), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+@contextmanager
+def span(name, rows=None, profile=None, summary=False):
+    """
+    Mede um trecho do código. `rows` pode ser informado na entrada ou depois,
+    via `sp["rows"] = n` no objeto retornado pelo `with`. Com `summary=True`, imprime
+    a tabela-resumo ao sair, se este for o span mais externo.
+    """
+    global _profiler_active
+    profile = PROFILE if profile is None else set(profile)
+    rec = {"run_id": RUN_ID, "name": name, "parent": _stack[-1]["name"] if _stack else None,
+           "rows": rows, "_tm_peak": 0, "_start": datetime.now().isoformat(timespec="milliseconds")}
+
+    trace = "tracemalloc" in profile
+    if trace:
+        if tracemalloc.is_tracing():
+            if _stack:  # guarda o pico do span pai antes de zerar
+                _stack[-1]["_tm_peak"] = max(_stack[-1]["_tm_peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            rec["_tm_owner"] = True
+
+    profiler = None
+    if "cprofile" in profile and not _profiler_active:
+        profiler, _profiler_active = cProfile.Profile(), True
+        profiler.enable()
+
+    _stack.append(rec)
+    rss0 = _rss_mb()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    status = "ok"
+    try:
+        yield rec
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+        _stack.pop()
+
+        if profiler is not None:
+            profiler.disable()
+            _profiler_active = False
+            prof_dir = LOG_DIR / "profiles"
+            prof_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(prof_dir / f"{RUN_ID}_{name}.prof")
+
+        py_peak = None
+        if trace:
+            py_peak = max(rec["_tm_peak"], tracemalloc.get_traced_memory()[1])
+            if rec.get("_tm_owner"):
+                tracemalloc.stop()
+            elif _stack:
+                _stack[-1]["_tm_peak"] = max(_stack[-1]["_tm_peak"], py_peak)
+
+        n = rec["rows"]
+        rss1, peak = _rss_mb(), _peak_rss_mb()
+        record = {
+            "run_id": RUN_ID,
+            "name": name,
+            "parent": rec["parent"],
+            "status": status,
+            "start": rec["_start"],
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "rows": n,
+            "rows_per_s": round(n / wall, 1) if n and wall > 0 else None,
+            "rss_delta_mb": round(rss1 - rss0, 1) if rss1 is not None and rss0 is not None else None,
+            "peak_rss_mb": round(peak, 1) if peak is not None else None,
+            "py_peak_mb": round(py_peak / 2**20, 1) if py_peak is not None else None,
+            "pid": os.getpid(),
+        }
+        _records.append(record)
+        _write(record)
+        if summary and not _stack and not _in_worker:
+            print_summary()
+
+def stage(name):
+    """Decorador: envolve a função inteira em um span (o resumo sai ao final do span mais externo)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, summary=True):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def worker_init():
+    """Initializer para pools de processos: descarta o estado herdado via fork e silencia o resumo."""
+    global _in_worker
+    _in_worker = True
+    _records.clear()
+    _stack.clear()
+
+def merge(recs):
+    """Anexa spans vindos de um processo filho (já gravados no log por ele)."""
+    _records.extend(recs)
+
+def records():
+    """Spans finalizados neste processo, na ordem em que terminaram."""
+    return list(_records)
+
+def drain():
+    """Devolve e esvazia os spans finalizados (workers que executam várias tarefas)."""
+    recs = list(_records)
+    _records.clear()
+    return recs
+
+def print_summary(recs=None):
+    """Imprime a tabela-resumo dos spans (padrão: todos os deste processo)."""
+    recs = _records if recs is None else recs
+    if not recs:
+        return
+    width = max(len(r["name"]) for r in recs)
+    print(f"\n⏱️  Resumo da execução {RUN_ID} (log: {log_path()})")
+    print(f"{'span':<{width}} {'wall s':>9} {'cpu s':>9} {'linhas':>11} {'linhas/s':>11} {'pico MB':>9}")
+    for r in recs:
+        rows = f"{r['rows']:,}" if r["rows"] is not None else "-"
+        rps = f"{r['rows_per_s']:,.0f}" if r["rows_per_s"] is not None else "-"
+        peak = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        flag = "" if r["status"] == "ok" else "  ❌"
+        print(f"{r['name']:<{width}} {r['wall_s']:>9.2f} {r['cpu_s']:>9.2f} {rows:>11} {rps:>11} "
+              f"{peak:>9}{flag}")
@@ -0,0 +1,147 @@
+"""
+Tabela de etapas do pipeline e controle do que está atualizado.
+
+Este módulo é importado pela CLI (run_pipeline.py) em todo comando, inclusive `--help` e
+`status`: não deve importar nada pesado. Os scripts das etapas só são importados quando a
+etapa realmente executa (`stage_entry`).
+"""
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from src.config import DATASET_CONFIG, FIGS, PROCESSED, RAW, REPORTS
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+STATE_FILE = PROCESSED / ".pipeline_state.json"
+
+# --- Etapas do pipeline, na ordem de execução ---
+# id -> (arquivo em scripts/, função de entrada)
+# O relatório (07) vem por último porque usa as estatísticas de termos da etapa 11.
+STAGES = {
+    "01": ("01_unify_datasets.py", "run"),
+    "02": ("02_build_features.py", "run"),
+    "03": ("03_vectorize_project.py", "run"),
+    "04": ("04_make_plots.py", "run"),
+    "05": ("05_topic_modeling.py", "run_topic_modeling"),
+    "06": ("06_sentiment_analysis.py", "run"),
+    "08": ("08_build_search_index.py", "run"),
+    "09": ("09_train_classifier.py", "run"),
+    "10": ("10_cluster_embedding.py", "run"),
+    "11": ("11_term_stats.py", "run"),
+    "07": ("07_generate_report.py", "run"),
+}
+
+# etapas cujas saídas cada etapa consome
+DEPENDS = {
+    "01": [],
+    "02": ["01"],
+    "03": ["02"],
+    "04": ["02", "03"],
+    "05": ["02"],
+    "06": ["02"],
+    "07": ["02", "04", "05", "06", "11"],
+    "08": ["02"],
+    "09": ["03"],
+    "10": ["03"],
+    "11": ["02", "03", "10"],
+}
+
+# arquivos que precisam existir para a etapa ser considerada concluída
+OUTPUTS = {
+    "01": [PROCESSED / "unified.csv"],
+    "02": [PROCESSED / "unified_with_features.csv", PROCESSED / "textstore" / "meta.json"],
+    "03": [PROCESSED / "umap2_full.csv", PROCESSED / "pca2_sample.csv", PROCESSED / "tsne2_sample.csv",
+           PROCESSED / "features" / "tfidf" / "X" / "meta.json"],
+    "04": [FIGS / "balanceamento_classes.png", FIGS / "umap_label.png"],
+    "05": [PROCESSED / "topics.json"],
+    "06": [PROCESSED / "unified_with_features.csv"],
+    "07": [REPORTS / "report.html"],
+    "08": [PROCESSED / "search_index" / "meta.json"],
+    "09": [REPORTS / "metrics" / "classifier_loso_tfidf.csv"],
+    "10": [PROCESSED / "clusters" / "cluster_ids.npy"],
+    "11": [PROCESSED / "termstats" / "meta.json"],
+}
+
+def external_inputs(stage_id):
+    """Arquivos de fora do pipeline lidos pela etapa (os datasets brutos, na etapa 01)."""
+    if stage_id == "01":
+        return [RAW / config["filename"] for config in DATASET_CONFIG]
+    return []
+
+def load_stage(stage_id):
+    """Importa o script de uma etapa como módulo (os nomes começam com dígitos)."""
+    filename, _ = STAGES[stage_id]
+    spec = importlib.util.spec_from_file_location(f"stage_{stage_id}", SCRIPTS / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # permite serializar funções do script (pools de processos)
+    spec.loader.exec_module(module)
+    return module
+
+def stage_entry(stage_id):
+    """Retorna a função de entrada de uma etapa."""
+    module = load_stage(stage_id)
+    return getattr(module, STAGES[stage_id][1])
+
+# --- Estado das execuções (carimbos por etapa) ---
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def read_state(path: Path = STATE_FILE):
+    if not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def mark_done(stage_id, state, path: Path = STATE_FILE):
+    """Registra que a etapa terminou agora, com as versões do script e das entradas externas."""
+    state[stage_id] = {
+        "finished_at": time.time(),
+        "script_mtime": _mtime(SCRIPTS / STAGES[stage_id][0]),
+        "inputs": {str(p): _mtime(p) for p in external_inputs(stage_id)},
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)  # escrita atômica
+
+def stage_status(stage_id, state, stale=()):
+    """
+    Motivo para executar a etapa de novo, ou None se está atualizada.
+    `stale` são as etapas que já se sabe que vão executar (invalidam as dependentes).
+    """
+    rec = state.get(stage_id)
+    if rec is None:
+        return "nunca executada"
+    missing = [p for p in OUTPUTS[stage_id] if not Path(p).exists()]
+    if missing:
+        return f"saída ausente: {missing[0]}"
+    if _mtime(SCRIPTS / STAGES[stage_id][0]) != rec.get("script_mtime"):
+        return "script alterado"
+    for p, mtime in rec.get("inputs", {}).items():
+        if _mtime(p) != mtime:
+            return f"entrada alterada: {p}"
+    for dep in DEPENDS[stage_id]:
+        if dep in stale:
+            return f"depende de {dep}, que será executada"
+        dep_rec = state.get(dep)
+        if dep_rec is None or dep_rec["finished_at"] > rec["finished_at"]:
+            return f"etapa {dep} mais recente"
+    return None
+
+def plan(stage_ids, state, force=False):
+    """Etapas (na ordem de STAGES) que precisam executar, com o motivo de cada uma."""
+    todo = {}
+    for sid in STAGES:
+        if sid not in stage_ids:
+            continue
+        reason = "forçada" if force else stage_status(sid, state, stale=todo)
+        if reason is not None:
+            todo[sid] = reason
+    return todo
@@ -0,0 +1,203 @@
+"""
+Registro de modelos treinados em data/processed/models.
+
+Cada artefato fica em models/<nome>/<versão>/, onde a versão é derivada dos parâmetros
+e do hash dos dados de entrada. Assim, rodar de novo uma etapa com os mesmos dados e
+parâmetros reaproveita o modelo em vez de treinar outra vez:
+
+    registry = ModelRegistry()
+    tfidf = TfidfVectorizer(min_df=10)
+    cached = registry.lookup("tfidf", tfidf, input_hash)
+    if cached is None:
+        X = tfidf.fit_transform(texts)
+        registry.save("tfidf", tfidf, input_hash)
+
+Para só saber se há cache (ex.: quando bastam os arrays salvos), `find` consulta o
+index.json e a existência do arquivo, sem desserializar o modelo.
+
+Os modelos são gravados com joblib sem compressão, e os arrays NumPy extras como .npy,
+para que possam ser carregados com mmap_mode (sem ler o arquivo inteiro para a memória).
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from src.config import PROCESSED
+from src.data_io import ensure_dir
+
+REGISTRY_DIR = PROCESSED / "models"
+
+def _bytes_view(arr):
+    """Bytes do array sem cópia quando já é contíguo (ex.: matrizes mapeadas em memória)."""
+    return memoryview(np.ascontiguousarray(arr)).cast("B")
+
+def hash_inputs(*parts) -> str:
+    """Hash estável de textos, DataFrames, arrays (densos ou esparsos) e valores simples."""
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (pd.Series, pd.DataFrame)):
+            h.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+        elif isinstance(part, np.ndarray):
+            h.update(str((part.shape, part.dtype)).encode())
+            h.update(_bytes_view(part))
+        elif hasattr(part, "tocsr"):  # matriz esparsa do scipy
+            m = part.tocsr()
+            h.update(str(m.shape).encode())
+            for arr in (m.data, m.indices, m.indptr):
+                h.update(_bytes_view(arr))
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+def model_params(model_or_params) -> dict:
+    """Parâmetros serializáveis de um estimador do scikit-learn (ou o próprio dict)."""
+    params = model_or_params if isinstance(model_or_params, dict) else model_or_params.get_params(deep=False)
+    return json.loads(json.dumps(params, sort_keys=True, default=str))
+
+class ModelRegistry:
+    def __init__(self, root: Path = REGISTRY_DIR):
+        self.root = Path(root)
+        self._warm = {}  # (nome, versão) -> modelo já carregado neste processo
+        # parâmetros de antes do treino, anotados por lookup() quando não há cache:
+        # alguns estimadores (ex.: UMAP) alteram get_params() durante o fit
+        self._pending = {}
+
+    # --- versões ---
+    def version_key(self, model_or_params, input_hash) -> str:
+        """Versão determinística: mesmos parâmetros + mesmos dados = mesma versão."""
+        return hash_inputs(model_params(model_or_params), input_hash)[:12]
+
+    def _dir(self, name, version):
+        return self.root / name / version
+
+    def versions(self, name):
+        """Metadados de todas as versões de um modelo, da mais antiga para a mais nova."""
+        index = self._read_index(name)
+        return [index["versions"][v] for v in index["order"]]
+
+    def latest(self, name):
+        return self._read_index(name).get("latest")
+
+    def meta(self, name, version="latest"):
+        version = self._resolve(name, version)
+        with open(self._dir(name, version) / "meta.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_index(self, name):
+        path = self.root / name / "index.json"
+        if not path.exists():
+            return {"latest": None, "order": [], "versions": {}}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, name, index):
+        path = self.root / name / "index.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)  # escrita atômica
+
+    def _resolve(self, name, version):
+        if version == "latest":
+            version = self.latest(name)
+            if version is None:
+                raise FileNotFoundError(f"Nenhuma versão registrada para o modelo '{name}' em {self.root}.")
+        return version
+
+    # --- gravação ---
+    def save(self, name, model, input_hash, params=None, arrays=None, extra=None) -> str:
+        """
+        Registra um modelo treinado e, opcionalmente, arrays associados (ex.: embedding),
+        gravados como .npy para leitura com mmap. Retorna a versão.
+        """
+        if params is None:
+            params = self._pending.pop((name, input_hash), None) or model
+        params = model_params(params)
+        version = self.version_key(params, input_hash)
+        vdir = self._dir(name, version)
+        ensure_dir(vdir)
+
+        joblib.dump(model, vdir / "model.joblib")  # sem compressão: permite mmap_mode
+        for key, arr in (arrays or {}).items():
+            np.save(vdir / f"{key}.npy", np.asarray(arr))
+
+        meta = {
+            "name": name,
+            "version": version,
+            "class": f"{type(model).__module__}.{type(model).__name__}",
+            "params": params,
+            "input_hash": input_hash,
+            "arrays": sorted(arrays or {}),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            **(extra or {}),
+        }
+        with open(vdir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+        index = self._read_index(name)
+        if version in index["order"]:
+            index["order"].remove(version)
+        index["order"].append(version)
+        index["versions"][version] = meta
+        index["latest"] = version
+        self._write_index(name, index)
+
+        self._warm[(name, version)] = model
+        return version
+
+    # --- leitura ---
+    def load(self, name, version="latest", mmap_mode="r"):
+        """Carrega um modelo (com os arrays internos mapeados em memória) e o mantém aquecido."""
+        version = self._resolve(name, version)
+        key = (name, version)
+        if key not in self._warm:
+            self._warm[key] = joblib.load(self._dir(name, version) / "model.joblib", mmap_mode=mmap_mode)
+        return self._warm[key]
+
+    def load_array(self, name, key, version="latest", mmap_mode="r"):
+        version = self._resolve(name, version)
+        return np.load(self._dir(name, version) / f"{key}.npy", mmap_mode=mmap_mode)
+
+    def find(self, name, model_or_params, input_hash):
+        """
+        Versão já treinada com esses parâmetros e dados, ou None, sem carregar o modelo
+        (útil quando só os arrays interessam e a biblioteca do modelo é cara de importar).
+        """
+        version = self.version_key(model_or_params, input_hash)
+        index = self._read_index(name)
+        # só o índice e a existência do arquivo: nada é desserializado
+        if version not in index["versions"] or not (self._dir(name, version) / "model.joblib").exists():
+            self._pending[(name, input_hash)] = model_params(model_or_params)
+            return None
+        # marca a versão reaproveitada como a mais recente
+        if index.get("latest") != version:
+            index["order"].remove(version)
+            index["order"].append(version)
+            index["latest"] = version
+            self._write_index(name, index)
+        return version
+
+    def lookup(self, name, model_or_params, input_hash, mmap_mode="r"):
+        """
+        Retorna o modelo já treinado com esses parâmetros e dados, ou None. Para só saber se
+        há cache (sem desserializar o modelo), use `find`.
+        """
+        version = self.find(name, model_or_params, input_hash)
+        return None if version is None else self.load(name, version, mmap_mode=mmap_mode)
+
+_default = None
+
+def get_registry() -> ModelRegistry:
+    """Registro compartilhado pelo processo (scripts, dashboard e serviço de scoring)."""
+    global _default
+    if _default is None:
+        _default = ModelRegistry()
+    return _default
+
+def load_model(name, version="latest", mmap_mode="r"):
+    """Atalho: modelo aquecido do registro padrão."""
+    return get_registry().load(name, version, mmap_mode=mmap_mode)
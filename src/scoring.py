@@ -0,0 +1,88 @@
+"""
+Scoring de textos novos com os mesmos passos do pipeline, usando os modelos do registro.
+
+    scorer = Scorer()                         # carrega os modelos uma vez (mmap)
+    rows = scorer.score_batch(["texto 1", "texto 2"])
+
+Para cada texto: limpeza (basic_clean), features numéricas, sentimento, tópico LDA e
+distribuição de tópicos, coordenadas no mapa UMAP e, quando registrados, probabilidade de
+ideação (classificador da etapa 09) e cluster (etapa 10). Todos os passos são em lote:
+uma chamada de transform por modelo para o lote inteiro.
+"""
+import numpy as np
+from src.features import numeric_features_frame
+from src.registry import get_registry
+from src.sentiment import analyze_sentiments
+from src.text_clean import basic_clean
+
+MAX_BATCH = 256  # maior lote esperado (o serviço HTTP agrupa pedidos até esse tamanho)
+WARMUP_TEXTS = [
+    "I feel so tired of everything and nobody would even notice if I was gone",
+    "Had a great day at the park with my friends, we played football and ate pizza!",
+    "cant sleep again... 3am and my head wont stop, why is it always like this #tired",
+    "Does anyone know a good study method for finals? My exams start next week @uni",
+]
+
+class Scorer:
+    def __init__(self, registry=None, with_umap=True):
+        self.registry = registry or get_registry()
+        self.tfidf = self.registry.load("tfidf")
+        self.count = self.registry.load("count_lda")
+        self.lda = self.registry.load("lda")
+        self.umap = None
+        if with_umap:
+            from src.config import use_numba_cache
+            use_numba_cache()  # o unpickle do UMAP importa umap/numba
+            self.umap = self.registry.load("umap2")
+        self.clf = self._optional("sgd_tfidf")
+        self.svd50 = self._optional("svd50")
+        self.kmeans = self._optional("kmeans")
+
+    def _optional(self, name):
+        return self.registry.load(name) if self.registry.latest(name) else None
+
+    def warmup(self, batch_size=MAX_BATCH):
+        """
+        Executa um lote do tamanho dos lotes reais antes do primeiro pedido: um único texto curto
+        não passa pelos mesmos caminhos do UMAP/numba (busca de vizinhos em lote), e a compilação
+        JIT ficaria para os primeiros pedidos.
+        """
+        texts = (WARMUP_TEXTS * (batch_size // len(WARMUP_TEXTS) + 1))[:batch_size]
+        self.score_batch(texts)
+
+    def score_batch(self, texts):
+        """Lista de dicts (um por texto, na mesma ordem) com todas as saídas do pipeline."""
+        texts = ["" if t is None else str(t) for t in texts]
+        clean = [basic_clean(t) for t in texts]
+        out = numeric_features_frame(clean)
+        out.insert(0, "text_clean", clean)
+        out = out.join(analyze_sentiments(clean))
+
+        X = self.tfidf.transform(clean)
+        topics = self.lda.transform(self.count.transform(clean))
+        out["topic"] = [f"Tópico {i + 1}" for i in topics.argmax(axis=1)]
+        out["topic_dist"] = [row.round(4).tolist() for row in topics]
+        if self.umap is not None:
+            coords = self.umap.transform(X)
+            out["umap1"], out["umap2"] = coords[:, 0], coords[:, 1]
+        if self.clf is not None:
+            out["prob_ideacao"] = self.clf.predict_proba(X)[:, 1]
+        if self.svd50 is not None and self.kmeans is not None:
+            from sklearn.preprocessing import normalize
+            from src.cluster import cluster_name
+            E = normalize(self.svd50.transform(X)).astype(np.float32)
+            out["cluster"] = [cluster_name(c) for c in self.kmeans.predict(E)]
+        return out.to_dict(orient="records")
+
+# --- Execução em processos (pool do serviço HTTP) ---
+
+_worker_scorer = None
+
+def init_worker(with_umap=True, warmup_batch=MAX_BATCH):
+    """Initializer do pool: cada processo carrega os modelos uma vez e aquece com um lote cheio."""
+    global _worker_scorer
+    _worker_scorer = Scorer(with_umap=with_umap)
+    _worker_scorer.warmup(warmup_batch)
+
+def score_in_worker(texts):
+    return _worker_scorer.score_batch(texts)
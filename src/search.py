@@ -0,0 +1,137 @@
+"""
+Índice invertido em disco para busca de textos (termo -> lista de ids de linha).
+
+Os ids são as posições das linhas em unified_with_features.csv. A tokenização é a mesma do
+TF-IDF/CountVectorizer (minúsculas, token_pattern padrão). Cada lista de postings é gravada
+com codificação delta (primeiro id absoluto, depois diferenças); listas cujas diferenças cabem
+em 16 bits vão para um array uint16 e as demais para um uint32. Tudo é aberto com mmap.
+
+    index = SearchIndex.open(INDEX_DIR)
+    ids = index.search("feel alone")        # linhas que contêm todos os termos
+"""
+import json
+from pathlib import Path
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from src.config import PROCESSED
+from src.data_io import ensure_dir
+
+INDEX_DIR = PROCESSED / "search_index"
+MAX_TERM_LEN = 40  # tokens maiores (URLs coladas, "aaaaaa...") ficam fora do índice
+
+def make_analyzer():
+    """Mesmo pré-processamento/tokenização do TfidfVectorizer usado na etapa 03."""
+    return CountVectorizer(lowercase=True).build_analyzer()
+
+def build_index(texts, out_dir: Path = INDEX_DIR):
+    """Constrói o índice a partir de uma sequência de textos (id = posição na sequência)."""
+    vectorizer = CountVectorizer(lowercase=True, binary=True, dtype=np.int8)
+    X = vectorizer.fit_transform(texts)
+    terms = vectorizer.get_feature_names_out()  # já em ordem alfabética, igual às colunas
+    keep = np.flatnonzero(np.char.str_len(terms.astype(str)) <= MAX_TERM_LEN)
+    terms = terms[keep]
+    csc = X.tocsc()[:, keep]
+    csc.sort_indices()
+    indptr, rows = csc.indptr.astype(np.int64), csc.indices.astype(np.int64)
+    lengths = np.diff(indptr)
+
+    # --- codificação delta: diferença para o id anterior dentro da mesma lista ---
+    deltas = np.empty_like(rows)
+    deltas[0:1] = rows[0:1]
+    deltas[1:] = rows[1:] - rows[:-1]
+    starts = indptr[:-1][lengths > 0]
+    deltas[starts] = rows[starts]
+
+    # maior delta de cada lista decide se ela cabe em uint16
+    max_delta = np.zeros(len(terms), dtype=np.int64)
+    nonempty = lengths > 0
+    if nonempty.any():
+        max_delta[nonempty] = np.maximum.reduceat(deltas, indptr[:-1][nonempty])
+    wide = max_delta > np.iinfo(np.uint16).max
+
+    term_of = np.repeat(np.arange(len(terms)), lengths)
+    in_wide = wide[term_of]
+    postings16 = deltas[~in_wide].astype(np.uint16)
+    postings32 = deltas[in_wide].astype(np.uint32)
+
+    # posição de cada lista dentro do seu array (uint16 ou uint32)
+    start = np.zeros(len(terms), dtype=np.int64)
+    for mask in (wide, ~wide):
+        start[mask] = np.concatenate([[0], np.cumsum(lengths[mask])[:-1]]) if mask.any() else 0
+
+    out_dir = Path(out_dir)
+    ensure_dir(out_dir)
+    # UTF-8 em largura fixa: a ordem dos bytes é a mesma dos code points, então a busca
+    # binária funciona direto no array mapeado
+    np.save(out_dir / "terms.npy", np.char.encode(terms.astype(str), "utf-8"))
+    np.save(out_dir / "start.npy", start)
+    np.save(out_dir / "length.npy", lengths)
+    np.save(out_dir / "wide.npy", wide)
+    np.save(out_dir / "postings16.npy", postings16)
+    np.save(out_dir / "postings32.npy", postings32)
+    meta = {
+        "n_docs": int(X.shape[0]),
+        "n_terms": int(len(terms)),
+        "n_postings": int(len(rows)),
+        "n_wide_terms": int(wide.sum()),
+    }
+    with open(out_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+class SearchIndex:
+    def __init__(self, terms, start, length, wide, postings16, postings32, meta):
+        self.terms, self.start, self.length, self.wide = terms, start, length, wide
+        self.postings16, self.postings32 = postings16, postings32
+        self.meta = meta
+        self.analyzer = make_analyzer()
+
+    @classmethod
+    def open(cls, in_dir: Path = INDEX_DIR, mmap_mode="r"):
+        in_dir = Path(in_dir)
+        load = lambda name: np.load(in_dir / f"{name}.npy", mmap_mode=mmap_mode)
+        with open(in_dir / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(load("terms"), load("start"), load("length"), load("wide"),
+                   load("postings16"), load("postings32"), meta)
+
+    def __len__(self):
+        return self.meta["n_docs"]
+
+    def term_id(self, term):
+        term = term.encode("utf-8")
+        i = int(np.searchsorted(self.terms, term))
+        return i if i < len(self.terms) and self.terms[i] == term else None
+
+    def postings(self, term):
+        """Ids (ordenados) das linhas que contêm o termo."""
+        i = self.term_id(term)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        arr = self.postings32 if self.wide[i] else self.postings16
+        s, n = int(self.start[i]), int(self.length[i])
+        return np.cumsum(arr[s:s + n], dtype=np.int64)
+
+    def doc_freq(self, term):
+        i = self.term_id(term)
+        return 0 if i is None else int(self.length[i])
+
+    def search(self, query, mode="all"):
+        """
+        Ids das linhas com todos os termos da consulta (mode="all") ou com qualquer um
+        (mode="any"). Na interseção, começa pela lista mais curta.
+        """
+        tokens = list(dict.fromkeys(self.analyzer(query)))
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        if mode == "any":
+            lists = [self.postings(t) for t in tokens]
+            return np.unique(np.concatenate(lists))
+
+        tokens.sort(key=self.doc_freq)
+        result = self.postings(tokens[0])
+        for t in tokens[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, self.postings(t), assume_unique=True)
+        return result
@@ -0,0 +1,36 @@
+from functools import lru_cache
+import pandas as pd
+
+@lru_cache(maxsize=None)
+def _textblob():
+    """Importa o TextBlob (pesado) uma única vez, na primeira análise, e não ao importar o módulo."""
+    from textblob import TextBlob
+    return TextBlob
+
+def analyze_sentiment(text):
+    """
+    Analisa um texto e retorna polaridade, subjetividade e um rótulo de sentimento.
+    Otimizado para ser chamado uma única vez por texto.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return 0.0, 0.0, 'Neutro'
+
+    analysis = _textblob()(text)
+    polarity = analysis.sentiment.polarity
+    subjectivity = analysis.sentiment.subjectivity
+
+    if polarity > 0:
+        label = 'Positivo'
+    elif polarity < 0:
+        label = 'Negativo'
+    else:
+        label = 'Neutro'
+
+    return polarity, subjectivity, label
+
+def analyze_sentiments(texts) -> pd.DataFrame:
+    """Versão em lote: uma linha por texto com polaridade, subjetividade e rótulo."""
+    return pd.DataFrame(
+        [analyze_sentiment(t) for t in texts],
+        columns=["sentiment_polarity", "sentiment_subjectivity", "sentiment_label"],
+    )
@@ -0,0 +1,230 @@
+"""
+Serviço HTTP local de scoring (somente biblioteca padrão: asyncio).
+
+Pedidos concorrentes são agrupados em micro-lotes: o primeiro pedido abre uma janela curta
+(window_ms) e tudo o que chegar até ela fechar, ou até max_batch textos, vira um único lote
+enviado ao pool de processos (src.scoring). Enquanto todos os workers estão ocupados, os
+pedidos se acumulam na fila, então os lotes crescem sozinhos sob carga.
+
+Rotas:
+    POST /score    {"texts": ["...", ...]} ou {"text": "..."}  -> {"results": [...]}
+    GET  /health   -> {"status": "ok"}
+    GET  /metrics  -> vazão (textos/s, pedidos/s), latência p50/p99 e tamanho médio dos lotes
+"""
+import asyncio
+import contextlib
+import json
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src import scoring
+
+WINDOW_MS = 10
+MAX_BATCH = scoring.MAX_BATCH
+MAX_BODY = 10 * 2**20  # 10 MB
+
+class Metrics:
+    """
+    Contadores do serviço e dados dos pedidos mais recentes. A vazão é medida entre o
+    primeiro e o último dos pedidos recentes, para que o tempo ocioso não a dilua.
+    """
+    def __init__(self, keep=10_000):
+        self.started = time.perf_counter()
+        self.latencies_ms = deque(maxlen=keep)
+        self.batch_sizes = deque(maxlen=keep)
+        self.finished = deque(maxlen=keep)  # (instante de término, nº de textos) por pedido
+        self.requests = self.texts = self.batches = self.errors = 0
+
+    def record(self, n_texts, latency_ms):
+        self.requests += 1
+        self.texts += n_texts
+        self.latencies_ms.append(latency_ms)
+        self.finished.append((time.perf_counter(), n_texts))
+
+    def snapshot(self):
+        lat = np.fromiter(self.latencies_ms, dtype=np.float64)
+        pct = lambda q: round(float(np.percentile(lat, q)), 2) if len(lat) else None
+        span_s = (self.finished[-1][0] - self.finished[0][0]) if len(self.finished) > 1 else 0.0
+        recent_texts = sum(n for _, n in self.finished)
+        return {
+            "uptime_s": round(time.perf_counter() - self.started, 1),
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "errors": self.errors,
+            "requests_per_s": round((len(self.finished) - 1) / span_s, 2) if span_s else None,
+            "texts_per_s": round((recent_texts - self.finished[0][1]) / span_s, 2) if span_s else None,
+            "latency_ms_p50": pct(50),
+            "latency_ms_p99": pct(99),
+            "mean_batch_texts": round(float(np.mean(self.batch_sizes)), 1) if self.batch_sizes else None,
+        }
+
+class MicroBatcher:
+    def __init__(self, executor, n_workers, window_ms=WINDOW_MS, max_batch=MAX_BATCH, metrics=None):
+        self.executor = executor
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.metrics = metrics or Metrics()
+        self.queue = asyncio.Queue()
+        self.free_workers = asyncio.Semaphore(n_workers)
+        self._tasks = set()
+
+    async def submit(self, texts):
+        """Enfileira os textos de um pedido e espera os resultados deles."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # só monta um lote quando há worker livre: sob carga a fila cresce e os lotes também
+            await self.free_workers.acquire()
+            items = [await self.queue.get()]
+            n_texts = len(items[0][0])
+            deadline = loop.time() + self.window
+            while n_texts < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n_texts += len(item[0])
+            task = asyncio.create_task(self._dispatch(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, items):
+        loop = asyncio.get_running_loop()
+        texts = [t for batch, _ in items for t in batch]
+        try:
+            results = await loop.run_in_executor(self.executor, scoring.score_in_worker, texts)
+        except Exception as exc:  # falha do lote inteiro: todos os pedidos recebem o erro
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            self.free_workers.release()
+        self.metrics.batches += 1
+        self.metrics.batch_sizes.append(len(texts))
+        start = 0
+        for batch, future in items:
+            if not future.done():
+                future.set_result(results[start:start + len(batch)])
+            start += len(batch)
+
+# --- HTTP mínimo (HTTP/1.1 com keep-alive) ---
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+async def _write_json(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+def _parse_texts(body):
+    payload = json.loads(body or b"{}")
+    if isinstance(payload, dict) and isinstance(payload.get("texts"), list):
+        return [t if isinstance(t, str) else "" for t in payload["texts"]]
+    if isinstance(payload, dict) and isinstance(payload.get("text"), str):
+        return [payload["text"]]
+    raise ValueError('Corpo esperado: {"texts": [...]} ou {"text": "..."}')
+
+class ScoringServer:
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+        self.metrics = batcher.metrics
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    await _write_json(writer, 413, {"error": "corpo grande demais"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await self.route(method, path.split("?")[0], body)
+                await _write_json(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if path != "/score":
+            return 404, {"error": f"rota desconhecida: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        t0 = time.perf_counter()
+        try:
+            texts = _parse_texts(body)
+        except ValueError as exc:  # inclui JSON inválido
+            self.metrics.errors += 1
+            return 400, {"error": str(exc)}
+        try:
+            results = await self.batcher.submit(texts) if texts else []
+        except Exception as exc:
+            self.metrics.errors += 1
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+        self.metrics.record(len(texts), (time.perf_counter() - t0) * 1000)
+        return 200, {"results": results}
+
+async def serve(host="127.0.0.1", port=8765, workers=1, window_ms=WINDOW_MS, max_batch=MAX_BATCH,
+                with_umap=True, ready=None):
+    """Sobe o pool (modelos carregados e aquecidos em cada worker) e atende até ser interrompido."""
+    loop = asyncio.get_running_loop()
+    # SIGTERM encerra como Ctrl+C: o pool é desligado e os workers não ficam órfãos
+    with contextlib.suppress(NotImplementedError):  # Windows não tem add_signal_handler
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    with ProcessPoolExecutor(max_workers=workers, initializer=scoring.init_worker,
+                             initargs=(with_umap, max_batch)) as executor:
+        # garante que todos os workers carregaram os modelos antes de aceitar conexões
+        await asyncio.gather(*[loop.run_in_executor(executor, scoring.score_in_worker, ["warm up"])
+                               for _ in range(workers)])
+        batcher = MicroBatcher(executor, workers, window_ms, max_batch)
+        server = ScoringServer(batcher)
+        batch_task = asyncio.create_task(batcher.run())
+        async with await asyncio.start_server(server.handle, host, port) as srv:
+            if ready is not None:
+                ready(srv)
+            try:
+                await srv.serve_forever()
+            except asyncio.CancelledError:
+                pass
+            finally:
+                batch_task.cancel()
+                print(f"📈 Métricas finais: {json.dumps(server.metrics.snapshot(), ensure_ascii=False)}")
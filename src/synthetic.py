@@ -0,0 +1,118 @@
+"""
+Geração de corpora sintéticos no formato dos arquivos de DATASET_CONFIG.
+Usado pelos benchmarks: roda totalmente offline e é determinístico pela seed.
+"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config import DATASET_CONFIG
+from src.data_io import ensure_dir, save_csv
+
+# --- Perfil de cada fonte ---
+# share: fração das linhas, style: tweet (curto) ou reddit (post longo),
+# labels: (positivo, negativo) como aparecem no arquivo original, p_pos: fração de ideação
+SOURCE_PROFILES = {
+    "DatasetA": {"share": 0.55, "style": "reddit", "labels": ("suicide", "non-suicide"), "p_pos": 0.5},
+    "DatasetB": {"share": 0.05, "style": "tweet", "labels": ("Potential Suicide post ", "Not Suicide post"), "p_pos": 0.35},
+    "DatasetC": {"share": 0.15, "style": "tweet", "labels": (1, 0), "p_pos": 0.4},
+    "DatasetD": {"share": 0.25, "style": "reddit", "labels": ("suicide", "non-suicide"), "p_pos": 0.5},
+}
+
+RISK_WORDS = ["die", "alone", "pain", "end", "hopeless", "tired", "worthless", "kill", "goodbye",
+              "empty", "suicide", "hurt", "cant", "anymore", "nobody", "dark", "sleep", "forever"]
+CONTROL_WORDS = ["game", "friends", "school", "movie", "fun", "love", "music", "happy", "lol",
+                 "work", "weekend", "food", "team", "party", "funny", "class", "dog", "trip"]
+COMMON_WORDS = ["i", "the", "to", "and", "a", "my", "it", "of", "is", "that", "in", "me", "just",
+                "you", "so", "have", "but", "for", "not", "this", "was", "be", "like", "do", "feel",
+                "want", "know", "with", "on", "get", "all", "life", "people", "time", "really"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "su", "no", "vi", "de", "pa", "ri", "zo", "ne", "ba", "tu", "ge"]
+
+CHUNK_ROWS = 50_000  # gera o texto em blocos para limitar a memória em 1M+ linhas
+
+def build_vocab(size=20_000, seed=0):
+    """Vocabulário: palavras comuns reais seguidas de pseudo-palavras, em ordem de frequência (Zipf)."""
+    rng = np.random.default_rng(seed)
+    words = list(COMMON_WORDS)
+    seen = set(words)
+    while len(words) < size:
+        n_syl = rng.integers(2, 5)
+        w = "".join(rng.choice(SYLLABLES, size=n_syl))
+        if w not in seen:
+            seen.add(w)
+            words.append(w)
+    ranks = np.arange(1, size + 1)
+    probs = 1.0 / ranks ** 1.1
+    return np.array(words), probs / probs.sum()
+
+def _lengths(rng, style, n):
+    if style == "tweet":
+        return rng.integers(5, 30, size=n)
+    # posts do Reddit: cauda longa, alguns com centenas de palavras
+    return np.clip(rng.lognormal(mean=4.0, sigma=0.8, size=n), 10, 1500).astype(int)
+
+def _decorate(rng, text, style, upper):
+    if style == "tweet":
+        r = rng.random(3)
+        if r[0] < 0.3:
+            text = f"@user{rng.integers(1000)} {text}"
+        if r[1] < 0.25:
+            text = f"{text} #tag{rng.integers(200)}"
+        if r[2] < 0.1:
+            text = f"{text} https://t.co/{rng.integers(10**6)}"
+    elif rng.random() < 0.3:
+        text = text.replace(" i ", "\n\ni ", 1)
+    return text.upper() if upper else text
+
+def make_source(source_name, n_rows, vocab, probs, seed=42):
+    """Gera o DataFrame de uma fonte com as mesmas colunas do arquivo original."""
+    config = next(c for c in DATASET_CONFIG if c["source_name"] == source_name)
+    profile = SOURCE_PROFILES[source_name]
+    rng = np.random.default_rng(seed)
+
+    labels = rng.random(n_rows) < profile["p_pos"]
+    texts = []
+    for start in range(0, n_rows, CHUNK_ROWS):
+        lab = labels[start:start + CHUNK_ROWS]
+        lengths = _lengths(rng, profile["style"], len(lab))
+        total = int(lengths.sum())
+        tokens = vocab[rng.choice(len(vocab), size=total, p=probs)]
+
+        # sinal de classe: parte dos tokens vem do léxico de risco ou de controle
+        row_lab = np.repeat(lab, lengths)
+        inject = rng.random(total) < 0.08
+        tokens = tokens.astype(object)
+        tokens[inject & row_lab] = rng.choice(RISK_WORDS, size=int((inject & row_lab).sum()))
+        tokens[inject & ~row_lab] = rng.choice(CONTROL_WORDS, size=int((inject & ~row_lab).sum()))
+
+        tokens = tokens.tolist()
+        upper = rng.random(len(lab)) < 0.02
+        pos = 0
+        for i, n in enumerate(lengths):
+            texts.append(_decorate(rng, " ".join(tokens[pos:pos + n]), profile["style"], upper[i]))
+            pos += n
+
+    # ~0,5% de duplicatas, como nos dados reais
+    n_dup = n_rows // 200
+    if n_dup:
+        src = rng.integers(0, n_rows, size=n_dup)
+        dst = rng.integers(0, n_rows, size=n_dup)
+        for s, d in zip(src, dst):
+            texts[d] = texts[s]
+            labels[d] = labels[s]
+
+    pos_val, neg_val = profile["labels"]
+    label_col = np.where(labels, pos_val, neg_val) if isinstance(pos_val, str) else labels.astype(int)
+    return pd.DataFrame({config["text_col"]: texts, config["label_col"]: label_col})
+
+def write_raw_corpus(raw_dir: Path, n_rows: int, seed=42):
+    """Escreve em raw_dir um arquivo por fonte de DATASET_CONFIG, somando n_rows linhas."""
+    ensure_dir(raw_dir)
+    vocab, probs = build_vocab(seed=seed)
+    counts = {}
+    for i, config in enumerate(DATASET_CONFIG):
+        name = config["source_name"]
+        n = max(1, int(round(n_rows * SOURCE_PROFILES[name]["share"])))
+        df = make_source(name, n, vocab, probs, seed=seed + i + 1)
+        save_csv(df, raw_dir / config["filename"])
+        counts[name] = n
+    return counts
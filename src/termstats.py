@@ -0,0 +1,168 @@
+"""
+Agregações esparsas de termos por grupo (classe, fonte, cluster...).
+
+Um grupo é representado pela matriz indicadora G (n_grupos x n_textos, um 1 por coluna, ver
+src.cluster.group_indicator);
+G @ X soma as linhas de X de cada grupo de uma só vez, sem groupby nem matriz densa.
+Com X mapeado em memória, a soma é feita em blocos de linhas.
+
+Vários agrupamentos (classe, fonte, classe×fonte, cluster) são empilhados numa única G, de modo
+que uma passada pelo corpus calcula, para todos os grupos ao mesmo tempo, frequência do termo
+(tf), frequência de documento (df), TF-IDF médio e log-odds contra o restante do agrupamento.
+O resultado é gravado em arrays compactos (TermStats), lidos pelo relatório e pelo app.
+
+    stats = TermStats.open()
+    stats.top("source", "DatasetA", by="log_odds")   # "sotaque" de uma fonte
+"""
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+from src.cluster import group_indicator
+from src.config import PROCESSED
+from src.data_io import ensure_dir
+
+STATS_DIR = PROCESSED / "termstats"
+PRIOR_TOKENS = 1_000  # força do prior de Dirichlet do log-odds, em pseudo-tokens
+
+# --- Estatísticas de termos para vários agrupamentos de uma vez ---
+
+def make_counter(tfidf):
+    """CountVectorizer com o pré-processamento e o vocabulário de um TfidfVectorizer treinado."""
+    own = CountVectorizer().get_params()
+    params = {k: v for k, v in tfidf.get_params().items() if k in own}
+    params.update(vocabulary=tfidf.vocabulary_, dtype=np.int32)
+    return CountVectorizer(**params)
+
+def stacked_indicator(groupings):
+    """
+    Indicadoras de vários agrupamentos ({nome: (códigos, nomes dos grupos)}) empilhadas: uma
+    linha por grupo de cada agrupamento, então cada texto tem um 1 em cada agrupamento.
+    """
+    return sp.vstack([group_indicator(codes, len(names)) for codes, names in groupings.values()]).tocsc()
+
+def group_term_sums(blocks, G):
+    """
+    tf, df e soma de TF-IDF por grupo (densos, n_grupos x n_termos) em uma passada pelos blocos
+    (idx, X_tfidf, C_contagens): um produto esparso G[:, idx] @ bloco por estatística.
+    """
+    tf = df = tfidf = None
+    for idx, X_block, C_block in blocks:
+        Gb = G[:, idx].tocsr()
+        present = C_block.copy()
+        present.data = np.ones_like(present.data)
+        parts = [(Gb @ C_block).toarray(), (Gb @ present).toarray(), (Gb @ X_block).toarray()]
+        if tf is None:
+            tf, df, tfidf = parts
+        else:
+            tf += parts[0]
+            df += parts[1]
+            tfidf += parts[2]
+    return tf, df, tfidf
+
+def log_odds(tf, prior_tokens=PRIOR_TOKENS):
+    """
+    z-score do log-odds de cada termo em cada grupo contra os demais grupos do mesmo agrupamento,
+    com prior de Dirichlet informativo proporcional à frequência do termo no agrupamento
+    (Monroe et al., 2008). O prior suaviza termos raros; a divisão pelo desvio padrão evita que
+    eles dominem o ranking. `tf` tem as contagens (n_grupos x n_termos) de um agrupamento.
+    """
+    tf = np.asarray(tf, dtype=np.float64)
+    total = tf.sum(axis=0)
+    alpha = prior_tokens * total / max(total.sum(), 1.0)
+    alpha0 = alpha.sum()
+    n_group = tf.sum(axis=1, keepdims=True)
+    rest = total - tf
+    n_rest = n_group.sum() - n_group
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (np.log(tf + alpha) - np.log(n_group + alpha0 - tf - alpha)
+                 - np.log(rest + alpha) + np.log(n_rest + alpha0 - rest - alpha))
+        z = delta / np.sqrt(1 / (tf + alpha) + 1 / (rest + alpha))
+    return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+def _count_dtype(max_value):
+    return np.uint32 if max_value <= np.iinfo(np.uint32).max else np.uint64
+
+def build_term_stats(blocks, groupings, terms, out_dir: Path = STATS_DIR, prior_tokens=PRIOR_TOKENS):
+    """
+    Calcula e grava as estatísticas de todos os agrupamentos.
+    blocks: iterável de (idx, X_tfidf, C_contagens), com idx = posições nos códigos.
+    groupings: {nome: (código do grupo de cada linha, -1 = fora; nomes dos grupos)}.
+    """
+    G = stacked_indicator(groupings)
+    tf, df, tfidf = group_term_sums(blocks, G)
+    n_docs = np.asarray(G.sum(axis=1)).ravel().astype(np.int64)
+    mean_tfidf = tfidf / np.maximum(n_docs, 1)[:, None]
+
+    meta = {"n_terms": int(len(terms)), "prior_tokens": prior_tokens, "groupings": {}}
+    lo = np.zeros_like(tf)
+    start = 0
+    for name, (_, names) in groupings.items():
+        stop = start + len(names)
+        lo[start:stop] = log_odds(tf[start:stop], prior_tokens)
+        meta["groupings"][name] = {"start": start, "groups": [str(g) for g in names]}
+        start = stop
+
+    out_dir = Path(out_dir)
+    ensure_dir(out_dir)
+    np.save(out_dir / "terms.npy", np.char.encode(np.asarray(terms).astype(str), "utf-8"))
+    np.save(out_dir / "tf.npy", tf.astype(_count_dtype(tf.max(initial=0))))
+    np.save(out_dir / "df.npy", df.astype(_count_dtype(df.max(initial=0))))
+    np.save(out_dir / "mean_tfidf.npy", mean_tfidf.astype(np.float32))
+    np.save(out_dir / "log_odds.npy", lo.astype(np.float32))
+    np.save(out_dir / "n_docs.npy", n_docs)
+    np.save(out_dir / "n_tokens.npy", tf.sum(axis=1).astype(np.int64))
+    with open(out_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    return meta
+
+class TermStats:
+    STATS = ("tf", "df", "mean_tfidf", "log_odds")
+
+    def __init__(self, terms, arrays, n_docs, meta):
+        self.terms, self.arrays, self.n_docs, self.meta = terms, arrays, n_docs, meta
+
+    @classmethod
+    def open(cls, in_dir: Path = STATS_DIR, mmap_mode="r"):
+        in_dir = Path(in_dir)
+        with open(in_dir / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        terms = np.char.decode(np.load(in_dir / "terms.npy"), "utf-8")
+        arrays = {s: np.load(in_dir / f"{s}.npy", mmap_mode=mmap_mode) for s in cls.STATS}
+        return cls(terms, arrays, np.load(in_dir / "n_docs.npy"), meta)
+
+    @staticmethod
+    def exists(in_dir: Path = STATS_DIR):
+        return (Path(in_dir) / "meta.json").exists()
+
+    @property
+    def groupings(self):
+        return list(self.meta["groupings"])
+
+    def groups(self, grouping):
+        return self.meta["groupings"][grouping]["groups"]
+
+    def _row(self, grouping, group):
+        info = self.meta["groupings"][grouping]
+        return info["start"] + info["groups"].index(str(group))
+
+    def table(self, grouping, group, idx=None):
+        """Estatísticas de um grupo, um termo por linha (todos os termos ou só os de idx)."""
+        row = self._row(grouping, group)
+        idx = np.arange(len(self.terms)) if idx is None else np.asarray(idx)
+        out = pd.DataFrame({"termo": self.terms[idx]})
+        for s in self.STATS:
+            out[s] = np.asarray(self.arrays[s][row])[idx]
+        out["df_frac"] = out["df"] / max(int(self.n_docs[row]), 1)
+        return out
+
+    def top(self, grouping, group, by="log_odds", n=20, min_df=1):
+        """Os n termos com maior `by` no grupo (entre os que aparecem em pelo menos min_df textos)."""
+        row = self._row(grouping, group)
+        score = np.asarray(self.arrays[by][row], dtype=np.float64)
+        score = np.where(np.asarray(self.arrays["df"][row]) >= min_df, score, -np.inf)
+        idx = np.argsort(-score, kind="stable")[:n]
+        idx = idx[np.isfinite(score[idx])]
+        return self.table(grouping, group, idx)
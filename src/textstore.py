@@ -0,0 +1,119 @@
+"""
+Armazenamento dos textos para acesso aleatório (amostras, drill-down, nuvens de palavras).
+
+Cada coluna de texto vira um buffer UTF-8 contíguo (<coluna>.bin) e um array de offsets int64
+(<coluna>_offsets.npy, n+1 posições): o texto da linha i são os bytes offsets[i]:offsets[i+1].
+Os ids são as posições das linhas em unified_with_features.csv (os mesmos do índice de busca
+e de cluster_ids.npy). Tudo é aberto com mmap, então buscar k textos custa O(k), sem carregar
+o corpus.
+
+    store = TextStore.open()
+    store.get(123)                              # text_clean da linha 123
+    ids, texts = store.sample(10, seed=42)      # amostra aleatória
+    store.frame(ids, ["text", "text_clean"])    # DataFrame indexado pelo id da linha
+"""
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config import PROCESSED
+from src.data_io import ensure_dir
+
+STORE_DIR = PROCESSED / "textstore"
+TEXT_COLUMNS = ["text", "text_clean"]
+BLOCK_ROWS = 100_000  # linhas codificadas por vez na construção
+
+def _as_text(value):
+    return value if isinstance(value, str) else ""  # NaN/None viram texto vazio
+
+def build_text_store(columns: dict, out_dir: Path = STORE_DIR):
+    """
+    Grava as colunas de texto ({nome: sequência de textos}, todas do mesmo tamanho).
+    A codificação é feita em blocos, então a memória extra não depende do tamanho do corpus.
+    """
+    out_dir = Path(out_dir)
+    ensure_dir(out_dir)
+    n_rows = {name: len(values) for name, values in columns.items()}
+    if len(set(n_rows.values())) > 1:
+        raise ValueError(f"Colunas com tamanhos diferentes: {n_rows}")
+
+    meta = {"n_rows": next(iter(n_rows.values()), 0), "columns": {}}
+    for name, values in columns.items():
+        values = values.tolist() if isinstance(values, pd.Series) else list(values)
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        pos = 0
+        with open(out_dir / f"{name}.bin", "wb") as f:
+            for start in range(0, len(values), BLOCK_ROWS):
+                block = values[start:start + BLOCK_ROWS]
+                encoded = [_as_text(v).encode("utf-8") for v in block]
+                lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+                offsets[start + 1:start + 1 + len(encoded)] = pos + np.cumsum(lengths)
+                pos += int(lengths.sum())
+                f.write(b"".join(encoded))
+        np.save(out_dir / f"{name}_offsets.npy", offsets)
+        meta["columns"][name] = {"bytes": pos}
+
+    with open(out_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+class TextStore:
+    def __init__(self, buffers, offsets, meta):
+        self.buffers, self.offsets, self.meta = buffers, offsets, meta
+
+    @classmethod
+    def open(cls, in_dir: Path = STORE_DIR):
+        in_dir = Path(in_dir)
+        with open(in_dir / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        buffers, offsets = {}, {}
+        for name, info in meta["columns"].items():
+            # np.memmap não aceita arquivo vazio
+            buffers[name] = (np.memmap(in_dir / f"{name}.bin", dtype=np.uint8, mode="r")
+                             if info["bytes"] else np.empty(0, dtype=np.uint8))
+            offsets[name] = np.load(in_dir / f"{name}_offsets.npy", mmap_mode="r")
+        return cls(buffers, offsets, meta)
+
+    @staticmethod
+    def exists(in_dir: Path = STORE_DIR):
+        return (Path(in_dir) / "meta.json").exists()
+
+    def __len__(self):
+        return self.meta["n_rows"]
+
+    @property
+    def columns(self):
+        return list(self.meta["columns"])
+
+    def get(self, row_id, column="text_clean"):
+        """Texto de uma linha."""
+        off = self.offsets[column]
+        return self.buffers[column][off[row_id]:off[row_id + 1]].tobytes().decode("utf-8")
+
+    def take(self, ids, column="text_clean"):
+        """Textos das linhas pedidas, na ordem dos ids."""
+        ids = np.asarray(ids, dtype=np.int64)
+        buf, off = self.buffers[column], self.offsets[column]
+        starts, ends = off[ids], off[ids + 1]
+        return [buf[s:e].tobytes().decode("utf-8") for s, e in zip(starts.tolist(), ends.tolist())]
+
+    def sample(self, k, column="text_clean", ids=None, seed=None):
+        """
+        Amostra aleatória (sem reposição) de k linhas, de todo o corpus ou só dentre os ids
+        dados (ex.: uma classe, um cluster, os pontos selecionados no mapa). Retorna
+        (ids ordenados, textos).
+        """
+        rng = np.random.default_rng(seed)
+        if ids is None:
+            chosen = rng.choice(len(self), size=min(k, len(self)), replace=False)
+        else:
+            ids = np.asarray(ids, dtype=np.int64)
+            chosen = ids[rng.choice(len(ids), size=min(k, len(ids)), replace=False)]
+        chosen = np.sort(chosen)
+        return chosen, self.take(chosen, column)
+
+    def frame(self, ids, columns=None):
+        """DataFrame com as colunas de texto das linhas pedidas, indexado pelo id da linha."""
+        ids = np.asarray(ids, dtype=np.int64)
+        columns = columns or self.columns
+        return pd.DataFrame({c: self.take(ids, c) for c in columns}, index=pd.Index(ids, name="row_id"))
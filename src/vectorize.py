@@ -1 +1,146 @@
-# espaço para funções de vetorização extra (ex.: char-ngrams, embeddings, etc.)
+"""
+Vetorização extra: char n-grams com hashing (sem vocabulário) e persistência de matrizes
+esparsas CSR em um formato que pode ser lido com mmap.
+
+O hashing leva cada n-grama de caracteres direto para uma coluna de um espaço de largura
+fixa (N_FEATURES): não há vocabulário para construir nem guardar, os blocos de linhas são
+independentes e podem ser processados em paralelo. Isso preserva grafias erradas, gírias e
+abreviações dos tweets, que o TF-IDF de palavras com min_df=10 descarta.
+"""
+import json
+from pathlib import Path
+import numpy as np
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from src.data_io import ensure_dir
+
+N_FEATURES = 2 ** 20
+NGRAM_RANGE = (2, 4)
+CHUNK_ROWS = 20_000
+
+def make_char_hasher(ngram_range=NGRAM_RANGE, n_features=N_FEATURES):
+    """HashingVectorizer de char n-grams (dentro dos limites de palavra), sem sinal alternado."""
+    return HashingVectorizer(
+        analyzer="char_wb",
+        ngram_range=tuple(ngram_range),
+        n_features=n_features,
+        alternate_sign=False,
+        norm=None,
+        dtype=np.float32,
+    )
+
+def _hash_chunk(hasher, texts):
+    X = hasher.transform(texts)
+    # tf sublinear + norma L2: sem estado global (não precisa de IDF), cada bloco é independente
+    np.log1p(X.data, out=X.data)
+    return normalize(X, norm="l2", copy=False)
+
+def iter_char_ngram_blocks(texts, hasher=None, chunk_rows=CHUNK_ROWS, n_jobs=-1):
+    """Gera, em ordem, os blocos CSR (um por fatia de `chunk_rows` textos), calculados em paralelo."""
+    hasher = hasher or make_char_hasher()
+    texts = list(texts)
+    chunks = (texts[i:i + chunk_rows] for i in range(0, len(texts), chunk_rows))
+    return Parallel(n_jobs=n_jobs, return_as="generator")(delayed(_hash_chunk)(hasher, c) for c in chunks)
+
+def char_ngram_matrix(texts, hasher=None, chunk_rows=CHUNK_ROWS, n_jobs=-1, out_dir=None):
+    """
+    Matriz CSR (n_textos x N_FEATURES) de char n-grams. Com `out_dir`, os blocos são
+    gravados à medida que ficam prontos e a matriz devolvida é a versão mapeada em memória.
+    """
+    blocks = iter_char_ngram_blocks(texts, hasher, chunk_rows, n_jobs)
+    if out_dir is None:
+        blocks = list(blocks)
+        if not blocks:
+            return sp.csr_matrix((0, (hasher or make_char_hasher()).n_features), dtype=np.float32)
+        return sp.vstack(blocks, format="csr")
+    with CSRWriter(out_dir) as writer:
+        for block in blocks:
+            writer.append(block)
+    return load_csr(out_dir)
+
+# --- Persistência de matrizes CSR ---
+
+class CSRWriter:
+    """
+    Grava uma matriz CSR bloco a bloco em out_dir:
+    data.bin, indices.bin (binários crus), indptr.npy e meta.json.
+    """
+    def __init__(self, out_dir: Path):
+        self.out_dir = Path(out_dir)
+        ensure_dir(self.out_dir)
+        self._data = open(self.out_dir / "data.bin", "wb")
+        self._indices = open(self.out_dir / "indices.bin", "wb")
+        self._indptr = [np.zeros(1, dtype=np.int64)]
+        self.n_rows, self.n_cols, self.nnz, self.dtype = 0, None, 0, None
+
+    def append(self, block):
+        block = sp.csr_matrix(block)
+        if self.n_cols is None:
+            self.n_cols, self.dtype = block.shape[1], block.dtype
+        elif block.shape[1] != self.n_cols or block.dtype != self.dtype:
+            raise ValueError(f"Bloco incompatível: {block.shape[1]} colunas/{block.dtype}, "
+                             f"esperado {self.n_cols}/{self.dtype}.")
+        block.sort_indices()
+        block.data.tofile(self._data)
+        block.indices.astype(np.int32, copy=False).tofile(self._indices)
+        self._indptr.append(block.indptr[1:].astype(np.int64) + self.nnz)
+        self.n_rows += block.shape[0]
+        self.nnz += block.nnz
+
+    def close(self):
+        self._data.close()
+        self._indices.close()
+        indptr = np.concatenate(self._indptr)
+        # indptr com o mesmo dtype dos índices evita que o scipy copie os arrays mapeados
+        if self.nnz < np.iinfo(np.int32).max:
+            indptr = indptr.astype(np.int32)
+        np.save(self.out_dir / "indptr.npy", indptr)
+        meta = {
+            "shape": [self.n_rows, self.n_cols or 0],
+            "nnz": int(self.nnz),
+            "dtype": str(self.dtype or np.float32),
+        }
+        with open(self.out_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def save_csr(X, out_dir: Path):
+    """Grava uma matriz esparsa inteira no formato de CSRWriter."""
+    with CSRWriter(out_dir) as writer:
+        writer.append(X)
+
+def load_csr(in_dir: Path, mmap_mode="r"):
+    """Abre uma matriz gravada por CSRWriter; com mmap_mode, nada é lido até ser usado."""
+    in_dir = Path(in_dir)
+    with open(in_dir / "meta.json", "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    shape, nnz = tuple(meta["shape"]), meta["nnz"]
+    indptr = np.load(in_dir / "indptr.npy", mmap_mode=mmap_mode)
+    if nnz == 0:
+        return sp.csr_matrix(shape, dtype=meta["dtype"])
+    if mmap_mode is None:
+        data = np.fromfile(in_dir / "data.bin", dtype=meta["dtype"])
+        indices = np.fromfile(in_dir / "indices.bin", dtype=np.int32)
+    else:
+        data = np.memmap(in_dir / "data.bin", dtype=meta["dtype"], mode=mmap_mode, shape=(nnz,))
+        indices = np.memmap(in_dir / "indices.bin", dtype=np.int32, mode=mmap_mode, shape=(nnz,))
+    return sp.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+def iter_csr_rows(X, block_rows=CHUNK_ROWS, rows=None):
+    """Percorre uma matriz CSR (ex.: mapeada em memória) em blocos de linhas."""
+    if rows is None:  # fatias contíguas: sem cópia dos índices
+        for start in range(0, X.shape[0], block_rows):
+            stop = min(start + block_rows, X.shape[0])
+            yield np.arange(start, stop), X[start:stop]
+        return
+    rows = np.asarray(rows)
+    for start in range(0, len(rows), block_rows):
+        idx = rows[start:start + block_rows]
+        yield idx, X[idx]
@@ -0,0 +1,185 @@
+"""
+Motor de renderização de dispersões grandes (UMAP, PCA, t-SNE).
+
+Em vez de desenhar cada ponto, os pontos são agregados em uma grade fixa com np.bincount
+(densidade ou contagem por categoria). O custo de desenhar passa a depender só do tamanho
+da grade, não do número de pontos:
+
+    raster = bin_points(df["umap1"], df["umap2"], categories=df["label"])
+    render_png(raster, FIGS / "umap_label.png", title="UMAP 2D colorido por label")
+    fig = tiles_figure(to_tiles(bin_points(..., bins=(200, 160))))   # versão interativa (plotly)
+"""
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+DEFAULT_BINS = (600, 480)        # PNG estático
+INTERACTIVE_BINS = (200, 160)    # no máximo 32 mil tiles no gráfico interativo
+CHUNK_POINTS = 5_000_000         # agrega em blocos para não duplicar arrays enormes na memória
+MISSING_CATEGORY = "ausente"     # camada dos pontos com categoria NaN/None
+PALETTE = ["#8888ff", "#ff6666", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b", "#e377c2",
+           "#7f7f7f", "#bcbd22", "#17becf"]
+
+class Raster(NamedTuple):
+    counts: np.ndarray      # (H, W) ou (n_categorias, H, W); linha 0 = menor y
+    extent: tuple           # (xmin, xmax, ymin, ymax)
+    categories: list        # [] quando é só densidade
+
+    @property
+    def total(self):
+        return self.counts if self.counts.ndim == 2 else self.counts.sum(axis=0)
+
+def bin_points(x, y, categories=None, bins=DEFAULT_BINS, extent=None) -> Raster:
+    """Agrega pontos 2D em uma grade W x H (densidade ou contagem por categoria)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ok = np.isfinite(x) & np.isfinite(y)
+    if not ok.all():
+        x, y = x[ok], y[ok]
+
+    codes, cats = None, []
+    if categories is not None:
+        categories = np.asarray(categories)
+        if not ok.all():
+            categories = categories[ok]
+        codes, uniques = pd.factorize(categories, sort=True)
+        cats = list(uniques)
+        missing = codes < 0  # factorize devolve -1 para NaN: vira uma camada própria
+        if missing.any():
+            codes[missing] = len(cats)
+            cats.append(MISSING_CATEGORY)
+
+    W, H = bins
+    if extent is None:
+        if len(x) == 0:
+            extent = (0.0, 1.0, 0.0, 1.0)
+        else:
+            extent = (float(x.min()), float(x.max()), float(y.min()), float(y.max()))
+    xmin, xmax, ymin, ymax = extent
+    sx = W / ((xmax - xmin) or 1.0)
+    sy = H / ((ymax - ymin) or 1.0)
+
+    n_layers = max(len(cats), 1)
+    counts = np.zeros(n_layers * H * W, dtype=np.int64)
+    for start in range(0, len(x), CHUNK_POINTS):
+        sl = slice(start, start + CHUNK_POINTS)
+        ix = np.clip(((x[sl] - xmin) * sx).astype(np.int64), 0, W - 1)
+        iy = np.clip(((y[sl] - ymin) * sy).astype(np.int64), 0, H - 1)
+        flat = iy * W + ix
+        if codes is not None:
+            flat += codes[sl].astype(np.int64) * (H * W)
+        counts += np.bincount(flat, minlength=counts.size)
+
+    counts = counts.reshape(n_layers, H, W) if cats else counts.reshape(H, W)
+    return Raster(counts, tuple(extent), cats)
+
+def spread(raster: Raster, px=1) -> Raster:
+    """Espalha cada célula para as vizinhas (soma em janela (2px+1)²), deixando pontos isolados visíveis."""
+    if px <= 0:
+        return raster
+    counts = raster.counts if raster.counts.ndim == 3 else raster.counts[None]
+    H, W = counts.shape[1:]
+    padded = np.pad(counts, ((0, 0), (px, px), (px, px)))
+    out = np.zeros_like(counts)
+    for dy in range(2 * px + 1):
+        for dx in range(2 * px + 1):
+            out += padded[:, dy:dy + H, dx:dx + W]
+    return raster._replace(counts=out if raster.counts.ndim == 3 else out[0])
+
+def shade(raster: Raster, cmap="viridis", colors=None, min_alpha=0.35):
+    """
+    Converte a grade em imagem RGBA (float, 0-1).
+    Densidade: escala log + colormap. Categorias: média das cores ponderada pelas contagens,
+    com opacidade proporcional ao log da densidade.
+    """
+    from matplotlib import colormaps
+    from matplotlib.colors import to_rgb
+
+    total = raster.total
+    filled = total > 0
+    level = np.log1p(total) / np.log1p(total.max() or 1)
+    img = np.zeros(total.shape + (4,))
+
+    if not raster.categories:
+        img[:] = colormaps[cmap](level)
+    else:
+        colors = colors or PALETTE
+        rgb = np.array([to_rgb(colors[i % len(colors)]) for i in range(len(raster.categories))])
+        mix = np.tensordot(raster.counts, rgb, axes=([0], [0]))  # (H, W, 3)
+        img[..., :3] = mix / np.maximum(total, 1)[..., None]
+        img[..., 3] = min_alpha + (1 - min_alpha) * level
+    img[~filled] = 0
+    return img
+
+def render_png(raster: Raster, path, title=None, xlabel=None, ylabel=None, colors=None,
+               figsize=(6, 5), dpi=180, spread_px=None):
+    """
+    Salva a grade como figura PNG (com legenda quando houver categorias).
+    spread_px=None espalha automaticamente quando menos de 5% das células têm pontos.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Patch
+
+    if spread_px is None:
+        spread_px = 1 if (raster.total > 0).mean() < 0.05 else 0
+    raster = spread(raster, spread_px)
+
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.imshow(shade(raster, colors=colors), origin="lower", extent=raster.extent,
+              aspect="auto", interpolation="nearest")
+    if raster.categories:
+        colors = colors or PALETTE
+        handles = [Patch(color=colors[i % len(colors)], label=str(c)) for i, c in enumerate(raster.categories)]
+        ax.legend(handles=handles, bbox_to_anchor=(1.02, 1), loc="upper left")
+    if title:
+        ax.set_title(title)
+    ax.set_xlabel(xlabel or "")
+    ax.set_ylabel(ylabel or "")
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+
+def to_tiles(raster: Raster) -> pd.DataFrame:
+    """
+    Tabela com uma linha por célula não vazia: centro (x, y), contagem total, contagem por
+    categoria, categoria dominante e sua fração. É a entrada do gráfico interativo.
+    """
+    total = raster.total
+    iy, ix = np.nonzero(total)
+    H, W = total.shape
+    xmin, xmax, ymin, ymax = raster.extent
+    tiles = pd.DataFrame({
+        "x": xmin + (ix + 0.5) * (xmax - xmin) / W,
+        "y": ymin + (iy + 0.5) * (ymax - ymin) / H,
+        "count": total[iy, ix],
+    })
+    if raster.categories:
+        per_cat = raster.counts[:, iy, ix]  # (n_categorias, n_tiles)
+        for i, c in enumerate(raster.categories):
+            tiles[f"n_{c}"] = per_cat[i]
+        dominant = per_cat.argmax(axis=0)
+        tiles["dominant"] = np.asarray(raster.categories, dtype=object)[dominant].astype(str)
+        tiles["share"] = per_cat.max(axis=0) / tiles["count"].to_numpy()
+    return tiles
+
+def tiles_figure(tiles: pd.DataFrame, title=None, colors=None, height=700):
+    """Gráfico plotly leve: um marcador por célula, tamanho pelo log da contagem."""
+    import plotly.express as px
+
+    size = np.log1p(tiles["count"])
+    hover = {c: True for c in tiles.columns if c.startswith("n_") or c in ("count", "share")}
+    hover.update({"x": False, "y": False})
+    if "dominant" in tiles.columns:
+        # mesma cor por categoria que render_png (ordem das colunas n_<categoria>)
+        colors = colors or PALETTE
+        cats = [c[2:] for c in tiles.columns if c.startswith("n_")]
+        fig = px.scatter(tiles, x="x", y="y", color="dominant", size=size, size_max=8,
+                         hover_data=hover, title=title,
+                         color_discrete_map={c: colors[i % len(colors)] for i, c in enumerate(cats)},
+                         category_orders={"dominant": cats})
+    else:
+        fig = px.scatter(tiles, x="x", y="y", color=size, size=size, size_max=8,
+                         hover_data=hover, title=title)
+    fig.update_traces(marker=dict(opacity=0.8, line=dict(width=0)))
+    fig.update_layout(height=height)
+    return fig